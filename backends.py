@@ -0,0 +1,132 @@
+import os
+import numpy as np
+
+from constants import MOVENET_HUB_URL
+
+# Every backend takes a (1, H, W, 3) int32 RGB batch and returns MoveNet MultiPose's (1, 6, 56) float32 output
+
+
+class InferenceBackend:
+    name = "base"
+
+    def __init__(self, path: str):
+        self.path = path
+        self.source = path
+
+    def infer(self, input_img: np.ndarray | None) -> np.ndarray:
+        raise NotImplementedError
+
+    # Runtimes that expose their input buffer override this to let the preprocessor write into it;
+    # infer(None) then runs on what was written
+    fill_input = None
+
+
+class SavedModelBackend(InferenceBackend):
+    name = "savedmodel"
+
+    def __init__(self, path: str, num_threads: int = 0):
+        super().__init__(path)
+        import tensorflow as tf
+
+        if num_threads:
+            tf.config.threading.set_intra_op_parallelism_threads(num_threads)
+            tf.config.threading.set_inter_op_parallelism_threads(1)
+
+        if os.path.isdir(path):
+            model = tf.saved_model.load(path)
+        else:
+            # No local copy yet: fall back to TF Hub (needs network on first run)
+            import tensorflow_hub as hub
+            print(f"[WARN] No SavedModel at '{path}', downloading from {MOVENET_HUB_URL}")
+            model = hub.load(MOVENET_HUB_URL)
+            self.source = MOVENET_HUB_URL
+        self._tf = tf
+        self._signature = model.signatures["serving_default"]
+
+    def infer(self, input_img: np.ndarray | None) -> np.ndarray:
+        return self._signature(self._tf.convert_to_tensor(input_img))["output_0"].numpy()
+
+
+class TFLiteBackend(InferenceBackend):
+    name = "tflite"
+
+    def __init__(self, path: str, num_threads: int = 0, use_xnnpack: bool = True):
+        super().__init__(path)
+        # tflite_runtime is a few MB and imports in milliseconds; full TF is the fallback
+        try:
+            from tflite_runtime import interpreter as tflite
+        except ImportError:
+            import tensorflow as tf
+            tflite = tf.lite
+
+        options = {"num_threads": num_threads or None}
+        resolver_types = getattr(tflite, "experimental", tflite)
+        resolver_type = getattr(resolver_types, "OpResolverType", None)
+        if not use_xnnpack and resolver_type is not None:
+            options["experimental_op_resolver_type"] = resolver_type.BUILTIN_WITHOUT_DEFAULT_DELEGATES
+
+        self._interpreter = tflite.Interpreter(model_path=path, **options)
+        self._input_index = self._interpreter.get_input_details()[0]["index"]
+        self._output_index = self._interpreter.get_output_details()[0]["index"]
+        self._resized_to = None
+
+    def _ensure_shape(self, shape) -> None:
+        if shape != self._resized_to:
+            self._interpreter.resize_tensor_input(self._input_index, shape, strict=False)
+            self._interpreter.allocate_tensors()
+            self._resized_to = shape
+
+    def fill_input(self, shape, write) -> None:
+        self._ensure_shape(shape)
+        # the view must be gone before invoke(), so it only lives for this call
+        write(self._interpreter.tensor(self._input_index)())
+
+    def infer(self, input_img: np.ndarray | None) -> np.ndarray:
+        if input_img is not None:
+            self._ensure_shape(input_img.shape)
+            self._interpreter.set_tensor(self._input_index, input_img)
+        self._interpreter.invoke()
+        return self._interpreter.get_tensor(self._output_index)
+
+
+class OnnxRuntimeBackend(InferenceBackend):
+    name = "onnx"
+
+    def __init__(self, path: str, num_threads: int = 0):
+        super().__init__(path)
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        options.inter_op_num_threads = 1
+        if num_threads:
+            options.intra_op_num_threads = num_threads
+
+        self._session = ort.InferenceSession(path, options, providers=["CPUExecutionProvider"])
+        self._input_name = self._session.get_inputs()[0].name
+
+    def infer(self, input_img: np.ndarray | None) -> np.ndarray:
+        return self._session.run(None, {self._input_name: input_img})[0]
+
+
+BACKENDS = {
+    SavedModelBackend.name: SavedModelBackend,
+    TFLiteBackend.name: TFLiteBackend,
+    OnnxRuntimeBackend.name: OnnxRuntimeBackend,
+}
+
+def backend_for_path(path: str) -> str:
+    if path.endswith(".tflite"):
+        return TFLiteBackend.name
+    if path.endswith(".onnx"):
+        return OnnxRuntimeBackend.name
+    return SavedModelBackend.name
+
+def create_backend(name: str, path: str, num_threads: int = 0) -> InferenceBackend:
+    # name "auto" picks the runtime from the model file
+    if name == "auto":
+        name = backend_for_path(path)
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown inference backend: {name} (choose from auto, {', '.join(BACKENDS)})")
+    return BACKENDS[name](path, num_threads=num_threads)
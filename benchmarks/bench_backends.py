@@ -0,0 +1,91 @@
+import argparse
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backends import create_backend
+from pose_engine import Preprocessor
+from synthetic import synthetic_frame
+
+# Parity and latency across inference backends on the same inputs.
+#   python benchmarks/bench_backends.py --savedmodel models/movenet_multipose_lightning \
+#       --tflite models/movenet.tflite --onnx models/movenet.onnx --threads 4 [--images dir]
+# Exits non-zero if any backend's keypoints drift from the first one by more than --tolerance.
+
+def load_inputs(image_dir: str | None, count: int) -> list[np.ndarray]:
+    preprocess = Preprocessor()
+    if image_dir:
+        import cv2
+        names = sorted(os.listdir(image_dir))[:count]
+        frames = [cv2.imread(os.path.join(image_dir, name)) for name in names]
+    else:
+        frames = [synthetic_frame(640, 480, seed) for seed in range(count)]
+    return [preprocess(frame).copy() for frame in frames if frame is not None]
+
+def compare(reference: np.ndarray, output: np.ndarray, min_score: float) -> float:
+    # Max keypoint coordinate difference over people the reference is confident about
+    confident = reference[0, :, 55] >= min_score
+    if not confident.any():
+        return 0.0
+    ref = reference[0, confident, :51].reshape(-1, 17, 3)
+    out = output[0, confident, :51].reshape(-1, 17, 3)
+    return float(np.abs(ref[:, :, :2] - out[:, :, :2]).max())
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare MoveNet inference backends.")
+    parser.add_argument("--savedmodel")
+    parser.add_argument("--tflite")
+    parser.add_argument("--onnx")
+    parser.add_argument("--threads", type=int, default=0)
+    parser.add_argument("--images", help="directory of real frames (default: synthetic frames)")
+    parser.add_argument("--count", type=int, default=20)
+    parser.add_argument("--runs", type=int, default=50)
+    parser.add_argument("--tolerance", type=float, default=0.02, help="normalized coordinate tolerance")
+    parser.add_argument("--min-score", type=float, default=0.2)
+    args = parser.parse_args()
+
+    configured = [(name, path) for name, path in
+                  (("savedmodel", args.savedmodel), ("tflite", args.tflite), ("onnx", args.onnx)) if path]
+    if not configured:
+        parser.error("give at least one model path")
+
+    inputs = load_inputs(args.images, args.count)
+    reference_outputs = None
+    parity_ok = True
+
+    print(f"{'backend':>11} {'load s':>7} {'mean ms':>8} {'p95 ms':>8} {'max diff':>9}")
+    for name, path in configured:
+        started = time.perf_counter()
+        backend = create_backend(name, path, args.threads)
+        backend.infer(inputs[0])  # warm up
+        load_s = time.perf_counter() - started
+
+        outputs = [backend.infer(batch).copy() for batch in inputs]
+        timings = []
+        for i in range(args.runs):
+            batch = inputs[i % len(inputs)]
+            started = time.perf_counter()
+            backend.infer(batch)
+            timings.append((time.perf_counter() - started) * 1000)
+
+        for output in outputs:
+            assert output.shape == (1, 6, 56), f"{name} returned {output.shape}, expected (1, 6, 56)"
+        if reference_outputs is None:
+            reference_outputs = outputs
+            max_diff = 0.0
+        else:
+            max_diff = max(compare(ref, out, args.min_score) for ref, out in zip(reference_outputs, outputs))
+            parity_ok &= max_diff <= args.tolerance
+
+        print(f"{name:>11} {load_s:>7.2f} {np.mean(timings):>8.2f} {np.percentile(timings, 95):>8.2f} {max_diff:>9.4f}")
+
+    if not parity_ok:
+        print(f"❌ backend outputs differ by more than {args.tolerance}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
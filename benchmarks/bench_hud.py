@@ -0,0 +1,51 @@
+import os
+import sys
+import timeit
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import cv2
+from constants import GameState
+from hud import HudCompositor, RED_TINT, draw_dynamic_hud, draw_static_hud
+
+# Per-frame HUD cost: redraw-everything + fresh tint overlay (old Game.run) vs. HudCompositor
+
+def legacy_render(frame, state, time_remaining, player_count, pulse_alpha):
+    draw_static_hud(frame, state)
+    draw_dynamic_hud(frame, state, time_remaining, player_count)
+    if pulse_alpha is not None:
+        overlay = np.full(frame.shape, RED_TINT, dtype=np.uint8)
+        cv2.addWeighted(overlay, pulse_alpha, frame, 1.0 - pulse_alpha, 0, frame)
+    return frame
+
+def main() -> None:
+    rng = np.random.default_rng(0)
+    compositor = HudCompositor()
+    runs = 300
+
+    print(f"{'resolution':>11} {'state':>12} {'legacy us':>10} {'compositor us':>14}")
+    for width, height in ((640, 480), (1280, 720), (1920, 1080)):
+        camera = rng.integers(0, 256, (height, width, 3), dtype=np.uint8)
+        frame = camera.copy()
+        for state, alpha in ((GameState.GREEN_LIGHT, None), (GameState.RED_LIGHT, 0.25)):
+            expected = legacy_render(camera.copy(), state, "00:03.25", 4, alpha)
+            actual = compositor.render(camera.copy(), state, "00:03.25", 4, alpha)
+            assert np.array_equal(expected, actual), "compositor output differs from the legacy HUD"
+
+            def legacy():
+                np.copyto(frame, camera)
+                legacy_render(frame, state, "00:03.25", 4, alpha)
+
+            def composited():
+                np.copyto(frame, camera)
+                compositor.render(frame, state, "00:03.25", 4, alpha)
+
+            copy_us = timeit.timeit(lambda: np.copyto(frame, camera), number=runs) / runs * 1e6
+            legacy_us = timeit.timeit(legacy, number=runs) / runs * 1e6 - copy_us
+            compositor_us = timeit.timeit(composited, number=runs) / runs * 1e6 - copy_us
+            print(f"{width}x{height:<6} {state.name:>12} {legacy_us:>10.1f} {compositor_us:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+import os
+import sys
+import timeit
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from box_ops import non_max_suppression
+from cv_interface import compute_iou
+
+# Micro-benchmark: greedy pure-Python IoU dedup vs. box_ops.non_max_suppression
+
+def python_dedup(boxes, scores, iou_threshold):
+    kept = []
+    for i in np.argsort(-scores, kind="stable"):
+        if any(compute_iou(boxes[i], boxes[j]) > iou_threshold for j in kept):
+            continue
+        kept.append(i)
+    return np.array(kept, dtype=np.intp)
+
+def random_boxes(rng, count, frame_w=1280, frame_h=720, size=80):
+    centers = rng.uniform((size, size), (frame_w - size, frame_h - size), size=(count, 2))
+    return np.hstack([centers - size / 2, centers + size / 2]).astype(int)
+
+def main() -> None:
+    rng = np.random.default_rng(0)
+    print(f"{'boxes':>6} {'python us':>10} {'box_ops us':>10}")
+    for count in (2, 4, 6, 8, 12, 24):  # MultiPose yields at most 6; <= NMS_LOOP_MAX_BOXES takes the loop path
+        boxes = random_boxes(rng, count)
+        scores = rng.uniform(0.2, 1.0, count)
+        assert np.array_equal(python_dedup(boxes, scores, 0.4), non_max_suppression(boxes, scores, 0.4))
+
+        runs = 2000
+        python_us = timeit.timeit(lambda: python_dedup(boxes, scores, 0.4), number=runs) / runs * 1e6
+        box_ops_us = timeit.timeit(lambda: non_max_suppression(boxes, scores, 0.4), number=runs) / runs * 1e6
+        print(f"{count:>6} {python_us:>10.1f} {box_ops_us:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+import os
+import sys
+import timeit
+import tracemalloc
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pose_engine import Preprocessor, preprocess_frame
+from synthetic import synthetic_frame
+
+# preprocess_frame (resize + cvtColor + astype per call) vs. the buffer-reusing Preprocessor
+
+def peak_allocation(fn) -> int:
+    fn()
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+def main() -> None:
+    preprocess = Preprocessor()
+    runs = 500
+
+    print(f"{'resolution':>11} {'before us':>10} {'after us':>10} {'before KiB':>11} {'after KiB':>10}")
+    for width, height in ((640, 480), (1280, 720), (1920, 1080)):
+        frame = synthetic_frame(width, height)
+        assert np.array_equal(preprocess_frame(frame), preprocess(frame))
+
+        before_us = timeit.timeit(lambda: preprocess_frame(frame), number=runs) / runs * 1e6
+        after_us = timeit.timeit(lambda: preprocess(frame), number=runs) / runs * 1e6
+        before_kib = peak_allocation(lambda: preprocess_frame(frame)) / 1024
+        after_kib = peak_allocation(lambda: preprocess(frame)) / 1024
+        print(f"{width}x{height:<6} {before_us:>10.1f} {after_us:>10.1f} {before_kib:>11.1f} {after_kib:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
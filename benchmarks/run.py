@@ -0,0 +1,134 @@
+import argparse
+import contextlib
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import cv2
+from constants import GameState
+from cv_interface import check_player_movement, extract_faces_from_keypoints, register_players
+from frame_context import FrameContext
+from hud import HudCompositor
+from motion import create_motion_detector
+from player_table import PLAYING, PlayerTable
+from pose_engine import Preprocessor, preprocess_frame
+from synthetic import StubPoseEngine, SyntheticPoses, synthetic_frame
+from tracker import PlayerTracker
+
+# Referee hot-path benchmarks on synthetic MoveNet output; no TensorFlow or camera needed.
+#   python benchmarks/run.py --out bench.json
+
+
+def measure(fn, iterations: int) -> dict:
+    fn()  # warm caches and lazy state
+
+    timings = np.empty(iterations)
+    for i in range(iterations):
+        start = time.perf_counter()
+        fn()
+        timings[i] = time.perf_counter() - start
+
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    timings *= 1e6
+    return {
+        "mean_us": round(float(timings.mean()), 2),
+        "p50_us": round(float(np.percentile(timings, 50)), 2),
+        "p95_us": round(float(np.percentile(timings, 95)), 2),
+        "peak_alloc_bytes": int(peak),
+    }
+
+def stages(width: int, height: int, players: int):
+    frame = synthetic_frame(width, height)
+    poses = SyntheticPoses(players)
+    engine = StubPoseEngine(poses)
+    people = poses.next()
+
+    tracker = PlayerTracker()
+    registered, _ = register_players(frame, people, tracker)
+    table = PlayerTable.from_players(registered)
+    detector = create_motion_detector("keypoint")
+    player = next(iter(registered.values()), None)
+    faces = extract_faces_from_keypoints(frame, people)[0]
+    hud = HudCompositor()
+    hud_frame = frame.copy()
+
+    def referee_tick():
+        ctx = FrameContext(frame, engine)
+        table.status[:] = PLAYING
+        tracker.retain(table.ids.tolist())
+        ctx.assignments = tracker.update(ctx.people, frame.shape)
+        if ctx.assignments:
+            rows = list(ctx.assignments.values())
+            table.set_keypoints(list(ctx.assignments), ctx.people[0, rows, :51].reshape(-1, 17, 3) * (height, width, 1))
+        check_player_movement(ctx, table, detector)
+
+    def render():
+        np.copyto(hud_frame, frame)
+        hud.render(hud_frame, GameState.RED_LIGHT, "00:03.25", players, 0.25)
+
+    preprocess = Preprocessor()
+
+    yield "preprocess_frame", lambda: preprocess_frame(frame)
+    yield "preprocessor_reused_buffers", lambda: preprocess(frame)
+    yield "extract_faces_fixed", lambda: extract_faces_from_keypoints(frame, people, box_policy="fixed")
+    yield "extract_faces_shoulder", lambda: extract_faces_from_keypoints(frame, people, box_policy="shoulder")
+    yield "tracker_update", lambda: tracker.update(people, frame.shape)
+    if player is not None and faces:
+        yield "player_is_moving", lambda: player.is_moving(faces[0])
+    yield "check_player_movement", referee_tick
+    yield "render_hud", render
+
+def parse_resolution(text: str) -> tuple[int, int]:
+    width, height = text.lower().split("x")
+    return int(width), int(height)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the referee hot path on synthetic poses.")
+    parser.add_argument("--resolutions", default="640x480,1280x720,1920x1080")
+    parser.add_argument("--players", default="1,3,6")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--out", help="write results as JSON")
+    args = parser.parse_args()
+
+    results = []
+    for resolution in args.resolutions.split(","):
+        width, height = parse_resolution(resolution)
+        for players in (int(p) for p in args.players.split(",")):
+            # hides the "Player_N initialized" lines register_players prints while stages() sets up;
+            # nothing timed prints, and event-log output comes from its own thread, which this doesn't catch
+            with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                measured = [(name, measure(fn, args.iterations)) for name, fn in stages(width, height, players)]
+            for name, stats in measured:
+                results.append({"stage": name, "resolution": resolution, "players": players, **stats})
+                print(f"{name:>24} {resolution:>10} {players:>2}p  "
+                      f"mean {stats['mean_us']:>9.1f} us  p95 {stats['p95_us']:>9.1f} us  "
+                      f"peak {stats['peak_alloc_bytes'] / 1024:>8.1f} KiB")
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "opencv": cv2.__version__,
+            "machine": platform.machine(),
+            "iterations": args.iterations,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+import numpy as np
+
+from pose_engine import MOVENET_INPUT_SIZE
+
+# Synthetic MoveNet MultiPose output: (1, 6, 56) rows of 17 x [y, x, score], [ymin, xmin, ymax, xmax], pose score
+
+MAX_PEOPLE = 6
+PERSON_HEIGHT = 0.6  # fraction of frame height
+
+# Standing pose, (dy, dx) from the person's centre in person heights
+STANDING_POSE = np.array([
+    (-0.42, 0.00), (-0.44, -0.02), (-0.44, 0.02), (-0.43, -0.04), (-0.43, 0.04),  # nose, eyes, ears
+    (-0.30, -0.10), (-0.30, 0.10), (-0.12, -0.13), (-0.12, 0.13), (0.02, -0.14), (0.02, 0.14),  # arms
+    (0.02, -0.07), (0.02, 0.07), (0.25, -0.07), (0.25, 0.07), (0.48, -0.07), (0.48, 0.07),  # legs
+], dtype=np.float32)
+
+
+class SyntheticPoses:
+    def __init__(self, players: int, seed: int = 0, jitter: float = 0.002, keypoint_score: float = 0.8):
+        self.players = min(players, MAX_PEOPLE)
+        self.rng = np.random.default_rng(seed)
+        self.jitter = jitter
+        self.keypoint_score = keypoint_score
+        self.centers = np.stack([np.full(self.players, 0.5),
+                                 (np.arange(self.players) + 1) / (self.players + 1)], axis=1).astype(np.float32)
+
+    def next(self) -> np.ndarray:
+        people = np.zeros((1, MAX_PEOPLE, 56), dtype=np.float32)
+        if not self.players:
+            return people
+
+        offsets = STANDING_POSE[None] * (PERSON_HEIGHT, PERSON_HEIGHT * 0.75)
+        keypoints = self.centers[:, None, :] + offsets
+        keypoints += self.rng.normal(0, self.jitter, keypoints.shape).astype(np.float32)
+        keypoints = np.clip(keypoints, 0, 1)
+
+        rows = people[0, :self.players]
+        rows[:, 0:51:3] = keypoints[:, :, 0]
+        rows[:, 1:51:3] = keypoints[:, :, 1]
+        rows[:, 2:51:3] = self.keypoint_score
+        rows[:, 51:53] = keypoints.min(axis=1)  # ymin, xmin
+        rows[:, 53:55] = keypoints.max(axis=1)  # ymax, xmax
+        rows[:, 55] = 0.9
+        return people
+
+
+class StubPoseEngine:
+    # Stands in for PoseEngine without TensorFlow: every call returns the next synthetic pose set
+    def __init__(self, poses: SyntheticPoses, input_size: int = MOVENET_INPUT_SIZE):
+        self.poses = poses
+        self.input_size = input_size
+        self.load_time_seconds = 0.0
+        self.memory_delta_mb = 0.0
+
+    def infer(self, input_img: np.ndarray) -> np.ndarray:
+        return self.poses.next()
+
+    def detect(self, frame: np.ndarray) -> np.ndarray:
+        return self.poses.next()
+
+def synthetic_frame(width: int, height: int, seed: int = 0) -> np.ndarray:
+    # Smooth gradient plus noise so crops and resizes aren't working on constant memory
+    rng = np.random.default_rng(seed)
+    ys, xs = np.mgrid[0:height, 0:width]
+    base = ((xs * 255 // max(width - 1, 1)) + (ys * 255 // max(height - 1, 1))) // 2
+    frame = np.repeat(base[:, :, None], 3, axis=2) + rng.integers(-8, 9, (height, width, 3))
+    return np.clip(frame, 0, 255).astype(np.uint8)
@@ -0,0 +1,53 @@
+import numpy as np
+
+# Boxes are (x1, y1, x2, y2) rows, same convention as cv_interface.compute_iou
+
+def box_areas(boxes: np.ndarray) -> np.ndarray:
+    return np.clip(boxes[:, 2] - boxes[:, 0], 0, None) * np.clip(boxes[:, 3] - boxes[:, 1], 0, None)
+
+def pairwise_iou(boxes_a: np.ndarray, boxes_b: np.ndarray) -> np.ndarray:
+    boxes_a = np.asarray(boxes_a, dtype=np.float32).reshape(-1, 4)
+    boxes_b = np.asarray(boxes_b, dtype=np.float32).reshape(-1, 4)
+
+    top_left = np.maximum(boxes_a[:, None, :2], boxes_b[None, :, :2])
+    bottom_right = np.minimum(boxes_a[:, None, 2:], boxes_b[None, :, 2:])
+    intersection = np.prod(np.clip(bottom_right - top_left, 0, None), axis=2)
+
+    union = box_areas(boxes_a)[:, None] + box_areas(boxes_b)[None, :] - intersection
+    return np.divide(intersection, union, out=np.zeros_like(intersection), where=union > 0)
+
+NMS_LOOP_MAX_BOXES = 8  # up to here a plain loop beats building the IoU matrix (bench_nms.py)
+
+def _nms_loop(boxes: list, order: list, iou_threshold: float) -> np.ndarray:
+    kept, kept_boxes = [], []
+    for i in order:
+        x1, y1, x2, y2 = boxes[i]
+        area = max(x2 - x1, 0) * max(y2 - y1, 0)
+        for kx1, ky1, kx2, ky2, kept_area in kept_boxes:
+            intersection = max(min(x2, kx2) - max(x1, kx1), 0) * max(min(y2, ky2) - max(y1, ky1), 0)
+            union = area + kept_area - intersection
+            if union > 0 and intersection / union > iou_threshold:
+                break
+        else:
+            kept.append(i)
+            kept_boxes.append((x1, y1, x2, y2, area))
+    return np.array(kept, dtype=np.intp)
+
+def non_max_suppression(boxes: np.ndarray, scores: np.ndarray, iou_threshold: float = 0.4) -> np.ndarray:
+    # Indices of the boxes to keep, highest score first
+    scores = np.asarray(scores)
+    if len(scores) == 0:
+        return np.empty(0, dtype=np.intp)
+
+    order = np.argsort(-scores, kind="stable")
+    if len(order) <= NMS_LOOP_MAX_BOXES:
+        return _nms_loop(np.asarray(boxes, dtype=np.float32).tolist(), order.tolist(), iou_threshold)
+
+    ranked = np.asarray(boxes, dtype=np.float32)[order]
+    overlaps = np.triu(pairwise_iou(ranked, ranked) > iou_threshold, k=1)  # only a better-scoring box suppresses
+
+    suppressed = np.zeros(len(order), dtype=bool)
+    for i in np.flatnonzero(overlaps.any(axis=1)):
+        if not suppressed[i]:
+            suppressed |= overlaps[i]
+    return order[~suppressed]
@@ -1,12 +1,40 @@
+import os
 from enum import Enum, auto
 
 
 RED_LIGHT_TIME_SECONDS: int = 5
 GREEN_LIGHT_TIME_MIN_SECONDS: int = 5
 GREEN_LIGHT_TIME_RANGE_SECONDS: int = 5
+RED_LIGHT_GRACE_SECONDS: float = 0.3  # reaction time after the light turns red before movement is judged
+
+# MoveNet MultiPose: local SavedModel directory, .tflite or .onnx file, hub URL only as a fallback
+MOVENET_MODEL_PATH: str = os.environ.get("MOVENET_MODEL_PATH", "models/movenet_multipose_lightning")
+# "auto" (from the model path), "savedmodel", "tflite" or "onnx"; 0 threads = runtime default
+INFERENCE_BACKEND: str = os.environ.get("MOVENET_BACKEND", "auto")
+INFERENCE_THREADS: int = int(os.environ.get("MOVENET_THREADS", "0"))
+# Frames per model call when batching several cameras; the published MultiPose signature takes 1,
+# raise it for a model exported with a dynamic batch dimension
+MOVENET_MAX_BATCH: int = int(os.environ.get("MOVENET_MAX_BATCH", "1"))
+# Optionally run MoveNet in a separate process fed through shared memory, pinned to e.g. MOVENET_WORKER_CPUS="2,3"
+INFERENCE_WORKER: bool = os.environ.get("MOVENET_WORKER", "0") == "1"
+INFERENCE_WORKER_CPUS: tuple[int, ...] = tuple(
+    int(cpu) for cpu in os.environ.get("MOVENET_WORKER_CPUS", "").split(",") if cpu.strip())
+INFERENCE_WORKER_MAX_FRAME: tuple[int, int] = (1080, 1920)  # largest frame (h, w) a shared-memory slot holds
+MOVENET_HUB_URL: str = "https://tfhub.dev/google/movenet/multipose/lightning/1"
+MOVENET_INPUT_SIZE: int = 256
+ROI_INFERENCE: bool = True  # once players are tracked, run MoveNet on the band they occupy
+KEYFRAME_INFERENCE: bool = True  # skip MoveNet on some green-light frames and extrapolate keypoints
+
+# Motion strategy used during red light: "keypoint" (pose displacement) or "pixel" (face-crop difference)
+MOTION_STRATEGY: str = "keypoint"
+MOTION_GATE: bool = True  # skip red-light pose inference while no tracked player's pixels change
+ADAPTIVE_THRESHOLDS: bool = True  # calibrate per-player motion thresholds while everyone stands still
+CALIBRATION_SECONDS: float = 3.0
+PLAYER_REGISTRY_PATH: str = os.environ.get("RLBL_PLAYER_REGISTRY", "player_registry")  # empty disables the registry
 
 class GameState(Enum):
     READ_FACES = auto()
+    CALIBRATE = auto()
     GREEN_LIGHT = auto()
     RED_LIGHT = auto()
     END_GAME = auto()
@@ -22,6 +50,7 @@ class Color(Enum):
 
 STATE_COLORS: dict[GameState, Color] = {
     GameState.READ_FACES: Color.WHITE,
+    GameState.CALIBRATE: Color.WHITE,
     GameState.GREEN_LIGHT: Color.GREEN,
     GameState.RED_LIGHT: Color.RED,
     GameState.END_GAME: Color.GRAY
@@ -1,59 +1,78 @@
-from player import Player
+from box_ops import non_max_suppression
+from events import Level, events
+from player import MOVING_FRAMES_TO_ELIMINATE, Player
+from pose_engine import get_pose_engine, preprocess_frame
+from typing import TYPE_CHECKING
 import cv2
 import numpy as np
-import tensorflow as tf
-import tensorflow_hub as hub
-
-# Load MoveNet MultiPose model
-movenet = hub.load("https://tfhub.dev/google/movenet/multipose/lightning/1")
-movenet_input_size = 256
-
-def preprocess_frame(frame):
-    img = cv2.resize(frame, (movenet_input_size, movenet_input_size))
-    img = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-    img = img.astype(np.int32)
-    return img[np.newaxis, ...]
-
-def extract_faces_from_keypoints(frame, people, threshold=0.3):
-    faces = []
-    draw_boxes = []
-    h, w, _ = frame.shape
-
-    for person in people[0]:
-        keypoints = np.reshape(person[:51], (17, 3))
-
-        # Only count person if enough confident keypoints
-        high_confidence_points = [kp for kp in keypoints if kp[2] >= threshold]
-        if len(high_confidence_points) < 6:
-            continue
-
-        x = int(keypoints[0][1] * w)
-        y = int(keypoints[0][0] * h)
-
-        face_size = 80
-        x1, y1 = max(0, x - face_size // 2), max(0, y - face_size // 2)
-        x2, y2 = min(w, x + face_size // 2), min(h, y + face_size // 2)
-
-        # FIXED NUM OF PEOPLE by filtering overlapping boxes
-        duplicate = False
-        for (ex1, ey1, ex2, ey2) in draw_boxes:
-            iou = compute_iou((x1, y1, x2, y2), (ex1, ey1, ex2, ey2))
-            if iou > 0.4:
-                duplicate = True
-                break
-        if duplicate:
-            continue
-
-        face = frame[y1:y2, x1:x2]
-        if face.size == 0:
-            continue
-
-        face_gray = cv2.cvtColor(face, cv2.COLOR_BGR2GRAY)
-        face_resized = cv2.resize(face_gray, (100, 100))
-        faces.append(face_resized)
-        draw_boxes.append((x1, y1, x2, y2))
-
-    return faces, draw_boxes
+
+if TYPE_CHECKING:
+    from frame_context import FrameContext
+    from motion import MotionDetector
+    from motion_thresholds import AdaptiveThresholds
+    from player_table import PlayerTable
+    from tracker import PlayerTracker
+
+FACE_CROP_SIZE = 100
+FIXED_FACE_BOX_SIZE = 80
+MIN_SHOULDER_FACE_BOX_SIZE = 60  # avoid too small faces
+
+NOSE, LEFT_SHOULDER, RIGHT_SHOULDER = 0, 5, 6
+POSE_SCORE = 55  # overall person score in each MoveNet row
+
+# Box policies:
+#   "fixed"    - 80px box around the nose, person kept if 6+ keypoints are confident
+#   "shoulder" - box side = shoulder width (min 60px), needs a confident nose and both shoulders
+def compute_face_boxes(people, frame_shape, threshold=0.3, box_policy="fixed"):
+    h, w = frame_shape[:2]
+    keypoints = people[0, :, :51].reshape(-1, 17, 3)  # (6, 17, [y, x, score])
+    confidence = keypoints[:, :, 2]
+
+    if box_policy == "fixed":
+        keep = (confidence >= threshold).sum(axis=1) >= 6
+        face_size = np.full(len(keypoints), FIXED_FACE_BOX_SIZE)
+    elif box_policy == "shoulder":
+        keep = (confidence[:, [NOSE, LEFT_SHOULDER, RIGHT_SHOULDER]] >= threshold).all(axis=1)
+        shoulders = (keypoints[:, [LEFT_SHOULDER, RIGHT_SHOULDER], :2] * (h, w)).astype(int)
+        shoulder_delta = shoulders[:, 1] - shoulders[:, 0]
+        shoulder_width = np.hypot(shoulder_delta[:, 0], shoulder_delta[:, 1]).astype(int)
+        face_size = np.maximum(shoulder_width, MIN_SHOULDER_FACE_BOX_SIZE)
+    else:
+        raise ValueError(f"Unknown box policy: {box_policy}")
+
+    nose_y = (keypoints[:, NOSE, 0] * h).astype(int)
+    nose_x = (keypoints[:, NOSE, 1] * w).astype(int)
+    half = face_size // 2
+    boxes = np.stack([
+        np.maximum(nose_x - half, 0),
+        np.maximum(nose_y - half, 0),
+        np.minimum(nose_x + half, w),
+        np.minimum(nose_y + half, h),
+    ], axis=1)
+
+    keep &= (boxes[:, 2] > boxes[:, 0]) & (boxes[:, 3] > boxes[:, 1])  # empty crops
+    return boxes, keep
+
+def select_face_boxes(people, frame_shape, threshold=0.3, box_policy="fixed", dedup_iou=0.4):
+    boxes, keep = compute_face_boxes(people, frame_shape, threshold, box_policy)
+
+    # FIXED NUM OF PEOPLE by filtering overlapping boxes, keeping the best-scoring pose of each cluster
+    rows = np.flatnonzero(keep)
+    if dedup_iou is not None and len(rows) > 1:
+        survivors = non_max_suppression(boxes[rows], people[0, rows, POSE_SCORE], dedup_iou)
+        rows = np.sort(rows[survivors])  # back to detection order
+    return rows, [tuple(box) for box in boxes[rows].tolist()]
+
+def crop_faces(frame, boxes):
+    if not boxes:
+        return []
+    # one grayscale conversion for the whole frame instead of one per crop
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    return [cv2.resize(gray[y1:y2, x1:x2], (FACE_CROP_SIZE, FACE_CROP_SIZE)) for x1, y1, x2, y2 in boxes]
+
+def extract_faces_from_keypoints(frame, people, threshold=0.3, box_policy="fixed", dedup_iou=0.4):
+    _, draw_boxes = select_face_boxes(people, frame.shape, threshold, box_policy, dedup_iou)
+    return crop_faces(frame, draw_boxes), draw_boxes
 
 #IoU stands for Intersection over Union - using it to make sure MoveNet doesn't double count the same person
 def compute_iou(boxA, boxB):
@@ -72,9 +91,40 @@ def compute_iou(boxA, boxB):
     return iou
 
 
-def get_player_filters(cap) -> dict[int, Player]:
+def register_players(frame, people, tracker: "PlayerTracker | None" = None) -> tuple[dict[int, Player], list]:
+    players = {}
+    rows, boxes = select_face_boxes(people, frame.shape)
+    faces = crop_faces(frame, boxes)
+
+    for next_id, (row, face) in enumerate(zip(rows, faces), start=1):
+        players[next_id] = Player(id=next_id, face_filter=face)
+        if tracker is not None:
+            tracker.register(next_id, people[0, row], frame.shape)
+        print(f"Player_{next_id} initialized")
+
+    return players, boxes
+
+def draw_player_boxes(frame, player_ids, boxes) -> None:
+    for player_id, (x1, y1, x2, y2) in zip(player_ids, boxes):
+        # Draw box and ID on frame
+        cv2.rectangle(frame, (x1, y1), (x2, y2), (0, 255, 0), 2)
+        cv2.putText(frame, f"Player {player_id}", (x1, y1 - 10),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 255, 0), 2)
+
+def confirm_players(frame, player_ids, boxes) -> bool:
+    # Operator checks players recognized from an earlier round: 'c' keeps them, 'r' registers everyone again
+    frame = frame.copy()
+    draw_player_boxes(frame, player_ids, boxes)
+    window = "Press 'c' to confirm players, 'r' to register again"
+    cv2.imshow(window, frame)
+    while True:
+        key = cv2.waitKey(0) & 0xFF
+        if key in (ord('c'), ord('r')):
+            cv2.destroyWindow(window)
+            return key == ord('c')
+
+def get_player_filters(cap, tracker: "PlayerTracker | None" = None) -> dict[int, Player]:
     players = {}
-    next_id = 1
 
     print("Initializing players... Press 'c' when all players are in frame.")
     while True:
@@ -86,24 +136,9 @@ def get_player_filters(cap) -> dict[int, Player]:
         cv2.imshow("Press 'c' to capture players", frame)
 
         if cv2.waitKey(1) & 0xFF == ord('c'):
-            input_img = preprocess_frame(frame)
-            outputs = movenet.signatures["serving_default"](tf.constant(input_img))
-            people = outputs["output_0"].numpy()
-
-            faces, boxes = extract_faces_from_keypoints(frame, people)
-
-            for i in range(len(faces)):
-                face = faces[i]
-                x1, y1, x2, y2 = boxes[i]
-
-                players[next_id] = Player(id=next_id, face_filter=face)
-                print(f"Player_{next_id} initialized")
-
-                # Draw box and ID on frame
-                cv2.rectangle(frame, (x1, y1), (x2, y2), (0, 255, 0), 2)
-                cv2.putText(frame, f"Player {next_id}", (x1, y1 - 10),
-                            cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 255, 0), 2)
-                next_id += 1
+            people = get_pose_engine().detect(frame)
+            players, boxes = register_players(frame, people, tracker)
+            draw_player_boxes(frame, players, boxes)
 
             # Show result for a second
             cv2.imshow("Detected Faces", frame)
@@ -113,44 +148,30 @@ def get_player_filters(cap) -> dict[int, Player]:
     cv2.destroyAllWindows()
     return players
 
-def check_player_movement(cap, players_playing: dict[int, Player], players_lost: dict[int, Player]) -> None:
-    ret, frame = cap.read()
-
-    if not ret or frame is None:
-        print("Could not read from webcam during red light.")
+def check_player_movement(ctx: "FrameContext", players: "PlayerTable", detector: "MotionDetector",
+                          thresholds: "AdaptiveThresholds | None" = None) -> None:
+    # Players not matched to a detection this frame aren't scored and keep their streak
+    player_ids, scores = detector.scores(ctx, players)
+    if len(player_ids) == 0:
         return
 
-    input_img = preprocess_frame(frame)
-    outputs = movenet.signatures["serving_default"](tf.constant(input_img))
-    people = outputs["output_0"].numpy()
-    _, boxes = extract_faces_from_keypoints(frame, people)
-
-    players_caught_ids: list[int] = []
-
-    for i, player_id in enumerate(list(players_playing.keys())):
-        if i >= len(boxes):
-            continue  # Not enough faces detected
-
-        x1, y1, x2, y2 = boxes[i]
-        face = frame[y1:y2, x1:x2]
-        if face.size == 0:
-            continue
-
-        face_gray = cv2.cvtColor(face, cv2.COLOR_BGR2GRAY)
-        face_resized = cv2.resize(face_gray, (100, 100))
-
-        if players_playing[player_id].is_moving(face_resized):
-            print(f"Player {player_id} moved! Eliminating...")
-            players_caught_ids.append(player_id)
-
-    for player_id in players_caught_ids:
-        players_lost[player_id] = players_playing.pop(player_id)
-
-def check_player_winning(players_playing, players_won, winning_threshold=300):
-    for pid, player in list(players_playing.items()):
-        if player.is_won(winning_threshold):
-            players_won[pid] = player
-            del players_playing[pid]
-            print(f"🏆 Player {pid} has won!")
-        else:
-            print(f"[Player {pid}] Has NOT yet won (face size {player.face_size}).")
+    if thresholds is not None:
+        face_sizes = players.face_size[players.slots(player_ids)]
+        limits, frames = thresholds.limits(player_ids, face_sizes)
+        thresholds.update(player_ids, scores, face_sizes)
+    else:
+        limits, frames = detector.threshold, MOVING_FRAMES_TO_ELIMINATE
+
+    if events.enabled(Level.DEBUG):
+        events.emit("motion_scores", Level.DEBUG, detector=detector.name,
+                    players=player_ids.tolist(), scores=scores.tolist(),
+                    thresholds=np.broadcast_to(limits, scores.shape).tolist())
+
+    for player_id in players.update_motion_streaks(player_ids, scores > limits, frames):
+        events.count("eliminations")
+        events.emit("eliminated", Level.INFO, f"Player {player_id} moved! Eliminating...", player=int(player_id))
+
+def check_player_winning(players: "PlayerTable", winning_threshold=300):
+    for pid in players.check_winning(winning_threshold):
+        events.count("wins")
+        events.emit("won", Level.INFO, f"🏆 Player {pid} has won!", player=int(pid))
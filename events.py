@@ -0,0 +1,109 @@
+import atexit
+import json
+import os
+import threading
+import time
+from collections import deque
+from enum import IntEnum
+
+
+class Level(IntEnum):
+    DEBUG = 10
+    INFO = 20
+    WARN = 30
+    OFF = 100
+
+
+class EventLog:
+    # Ring-buffered structured events plus in-process counters/timings; a background thread does all I/O
+    def __init__(self, level: Level = Level.INFO, console_level: Level = Level.INFO, path: str | None = None,
+                 capacity: int = 4096, flush_interval: float = 0.5):
+        self.level = level
+        self.console_level = console_level
+        self.path = path
+        self.flush_interval = flush_interval
+        self.recent: deque = deque(maxlen=capacity)  # last events, for in-process inspection
+        self.counters: dict[str, int] = {}
+        self.timings: dict[str, list[float]] = {}  # name -> [count, total seconds, max seconds]
+        self.dropped = 0
+        self._pending: deque = deque(maxlen=capacity)
+        self._wake = threading.Event()
+        self._flush_lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+
+    def enabled(self, level: Level) -> bool:
+        # Hot-path callers check this before building an event so disabled levels cost one comparison
+        return level >= self.level
+
+    def emit(self, kind: str, level: Level = Level.INFO, message: str | None = None, **fields) -> None:
+        if level < self.level:
+            return
+        event = (time.time(), kind, level, message, fields)
+        self.recent.append(event)
+        if len(self._pending) == self._pending.maxlen:
+            self.dropped += 1
+        self._pending.append(event)
+        self._ensure_exporter()
+
+    def count(self, name: str, amount: int = 1) -> None:
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def timing(self, name: str, seconds: float) -> None:
+        stats = self.timings.get(name)
+        if stats is None:
+            self.timings[name] = [1, seconds, seconds]
+        else:
+            stats[0] += 1
+            stats[1] += seconds
+            stats[2] = max(stats[2], seconds)
+
+    def metrics(self) -> dict:
+        return {
+            "counters": dict(self.counters),
+            "timings_ms": {name: {"count": count, "mean": round(total / count * 1000, 3), "max": round(peak * 1000, 3)}
+                           for name, (count, total, peak) in self.timings.items()},
+            "dropped_events": self.dropped,
+        }
+
+    def _ensure_exporter(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._export_loop, name="event-export", daemon=True)
+            self._thread.start()
+
+    def _export_loop(self) -> None:
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def flush(self) -> None:
+        with self._flush_lock:
+            lines = []
+            while self._pending:
+                timestamp, kind, level, message, fields = self._pending.popleft()
+                if message is not None and level >= self.console_level:
+                    print(message)
+                if self.path is not None:
+                    record = {"t": round(timestamp, 4), "kind": kind, "level": level.name, **fields}
+                    if message is not None:
+                        record["message"] = message
+                    lines.append(json.dumps(record, default=str))
+
+            if lines:
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write("\n".join(lines) + "\n")
+
+
+def _level_from_env(name: str, default: Level = Level.INFO) -> Level:
+    value = os.environ.get(name, default.name).strip().upper()
+    if value not in Level.__members__:
+        print(f"[WARN] {name}={value!r} is not one of {', '.join(Level.__members__)}; using {default.name}")
+        return default
+    return Level[value]
+
+
+events = EventLog(
+    level=_level_from_env("RLBL_EVENT_LEVEL"),
+    path=os.environ.get("RLBL_EVENT_LOG"),
+)
+atexit.register(events.flush)
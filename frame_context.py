@@ -0,0 +1,88 @@
+import time
+from typing import TYPE_CHECKING
+import numpy as np
+
+from cv_interface import crop_faces, select_face_boxes
+from pose_engine import PoseDetector, get_pose_engine
+from roi import RoiPlanner
+
+if TYPE_CHECKING:
+    from inference_scheduler import InferenceScheduler
+
+BOX_POLICIES = ("fixed", "shoulder")
+
+
+class FrameContext:
+    # Everything derived from one camera frame; each game tick captures once and shares this
+    def __init__(self, frame: np.ndarray, engine: PoseDetector | None = None, captured_at: float | None = None,
+                 roi_planner: RoiPlanner | None = None, scheduler: "InferenceScheduler | None" = None):
+        self.frame = frame
+        self.captured_at = time.monotonic() if captured_at is None else captured_at
+        self.roi_planner = roi_planner
+        self.scheduler = scheduler
+        self.roi: tuple[int, int, int, int] | None = None  # crop pose inference ran on, None = full frame
+        self.keyframe = True  # False when the scheduler extrapolated keypoints instead of running MoveNet
+        self.assignments: dict[int, int] = {}  # player id -> MoveNet row, filled in by the tracker
+        self._engine = engine
+        self._people: np.ndarray | None = None
+        self._detections: dict[str, dict[int, tuple[np.ndarray, tuple[int, int, int, int]]]] = {}
+
+    @classmethod
+    def capture(cls, cap, engine: PoseDetector | None = None, roi_planner: RoiPlanner | None = None,
+                scheduler: "InferenceScheduler | None" = None, clock=time.monotonic) -> "FrameContext | None":
+        ret, frame = cap.read()
+        captured_at = clock()  # replay stamps frames with media time instead
+        if not ret or frame is None:
+            return None
+        return cls(frame, engine, captured_at, roi_planner, scheduler)
+
+    @property
+    def age_seconds(self) -> float:
+        return time.monotonic() - self.captured_at
+
+    @property
+    def people(self) -> np.ndarray:
+        # Pose inference is lazy so ticks that never look at keypoints don't pay for it
+        if self._people is None:
+            if self.scheduler is not None:
+                self._people, self.keyframe = self.scheduler.people(self.frame, self._infer_people)
+            else:
+                self._people = self._infer_people()
+        return self._people
+
+    @property
+    def inferred(self) -> bool:
+        return self._people is not None
+
+    def provide_people(self, people: np.ndarray) -> None:
+        # pose output computed elsewhere, e.g. in a batch with other cameras' frames
+        self._people = people
+        self.keyframe = True
+
+    def _infer_people(self) -> np.ndarray:
+        engine = self._engine or get_pose_engine()
+        if self.roi_planner is not None:
+            self.roi = self.roi_planner.next_roi(self.frame.shape)
+        if self.roi is None:
+            return engine.detect(self.frame)
+        return engine.detect_roi(self.frame, self.roi)
+
+    def detections(self, box_policy: str = "fixed") -> dict[int, tuple[np.ndarray, tuple[int, int, int, int]]]:
+        # MoveNet row -> (100x100 gray face, face box), cached per box policy
+        if box_policy not in self._detections:
+            rows, boxes = select_face_boxes(self.people, self.frame.shape, box_policy=box_policy)
+            faces = crop_faces(self.frame, boxes)
+            self._detections[box_policy] = dict(zip(rows.tolist(), zip(faces, boxes)))
+        return self._detections[box_policy]
+
+    def player_detection(self, player_id: int, box_policy: str = "fixed"):
+        row = self.assignments.get(player_id)
+        if row is None:
+            return None
+        return self.detections(box_policy).get(row)
+
+    def prepare(self) -> "FrameContext":
+        # Run inference and crop extraction now, e.g. on a worker thread ahead of the game logic
+        for box_policy in BOX_POLICIES:
+            self.detections(box_policy)
+        return self
@@ -0,0 +1,83 @@
+import cv2
+import numpy as np
+
+from constants import GameState, STATE_COLORS
+
+FONT = cv2.FONT_HERSHEY_SIMPLEX
+BORDER_THICKNESS = 10
+LIGHT_W, LIGHT_H, LIGHT_MARGIN = 60, 140, 20
+RED_TINT = (0, 0, 255)  # BGR
+
+
+def draw_static_hud(frame: np.ndarray, state: GameState) -> None:
+    # Everything that only depends on the state and the frame size
+    border_color = STATE_COLORS[state]
+    height, width = frame.shape[:2]
+
+    # draw border and text
+    cv2.rectangle(frame, (0, 0), (width - 1, height - 1), border_color.value, thickness=BORDER_THICKNESS)
+    cv2.putText(frame, f"State: {state.name}", (10, 30), FONT, 1, border_color.value, 2)
+
+    # show current game state as a traffic light
+    x0 = width - LIGHT_W - LIGHT_MARGIN
+    y0 = LIGHT_MARGIN
+
+    # background box
+    cv2.rectangle(frame, (x0, y0), (x0 + LIGHT_W, y0 + LIGHT_H), (50, 50, 50), -1)
+
+    # circle parameters
+    radius = (LIGHT_W // 2) - 10
+    cx = x0 + LIGHT_W // 2
+    red_y = y0 + radius + 10
+    green_y = y0 + LIGHT_H - radius - 10
+    dark = (30, 30, 30)
+
+    # light on/off
+    if state == GameState.GREEN_LIGHT:
+        cv2.circle(frame, (cx, red_y), radius, dark, -1)  # red off
+        cv2.circle(frame, (cx, green_y), radius, (0, 255, 0), -1)  # green on
+    else:
+        cv2.circle(frame, (cx, red_y), radius, (0, 0, 255), -1)  # red on
+        cv2.circle(frame, (cx, green_y), radius, dark, -1)  # green off
+
+def draw_dynamic_hud(frame: np.ndarray, state: GameState, time_remaining: str | None, player_count: int) -> None:
+    border_color = STATE_COLORS[state]
+    height = frame.shape[0]
+
+    if time_remaining is not None:
+        cv2.putText(frame, time_remaining, (10, 60), FONT, 1, border_color.value, 2)
+
+    cv2.putText(frame, f"Players: {player_count}", (10, height - 20), FONT, 1, border_color.value, 2)
+
+class HudCompositor:
+    # Per-frame HUD without per-frame allocations: the red-light tint is built once and blended in place.
+    # The static HUD is simply redrawn; a few OpenCV primitives are cheaper than stamping a cached layer.
+    def __init__(self):
+        self._tint: np.ndarray | None = None
+        self._countdown_tenths = -1
+        self._countdown_text = ""
+
+    def _tint_buffer(self, shape) -> np.ndarray:
+        if self._tint is None or self._tint.shape != shape:
+            self._tint = np.empty(shape, dtype=np.uint8)
+            self._tint[:] = RED_TINT
+        return self._tint
+
+    def countdown(self, seconds: float) -> str:
+        # the label only changes every tenth of a second, so only format it then
+        tenths = int(seconds * 10)
+        if tenths != self._countdown_tenths:
+            minutes, rest = divmod(tenths, 600)
+            self._countdown_tenths = tenths
+            self._countdown_text = f"{minutes:02d}:{rest // 10:02d}.{rest % 10}"
+        return self._countdown_text
+
+    def render(self, frame: np.ndarray, state: GameState, time_remaining: str | None, player_count: int,
+               pulse_alpha: float | None = None) -> np.ndarray:
+        draw_static_hud(frame, state)
+        draw_dynamic_hud(frame, state, time_remaining, player_count)
+
+        # pulsing red light phase, blended in place against the reused tint buffer
+        if pulse_alpha is not None:
+            cv2.addWeighted(self._tint_buffer(frame.shape), pulse_alpha, frame, 1.0 - pulse_alpha, 0, dst=frame)
+        return frame
@@ -0,0 +1,81 @@
+from typing import Callable
+
+import cv2
+import numpy as np
+
+from box_ops import pairwise_iou
+from constants import GameState
+
+# Run MoveNet every Nth frame per state; red light is where eliminations are decided, so it never skips
+DEFAULT_CADENCE: dict[GameState, int] = {
+    GameState.READ_FACES: 3,
+    GameState.CALIBRATE: 1,
+    GameState.GREEN_LIGHT: 3,
+    GameState.RED_LIGHT: 1,
+    GameState.END_GAME: 1,
+}
+
+COORDINATES = np.r_[0:51:3, 1:51:3, 51:55]  # keypoint y/x and the person box, not the scores
+PERSON_BOX = slice(51, 55)
+DIFF_SIZE = (64, 48)  # frame-difference trigger runs on a tiny grayscale thumbnail
+
+
+class InferenceScheduler:
+    def __init__(self, state: Callable[[], GameState], cadence: dict[GameState, int] | None = None,
+                 motion_trigger: float = 12.0, match_iou: float = 0.3):
+        self.state = state
+        self.cadence = DEFAULT_CADENCE if cadence is None else cadence
+        self.motion_trigger = motion_trigger  # mean thumbnail change (0-255) that forces a keyframe
+        self.match_iou = match_iou
+        self.inferred = 0
+        self.skipped = 0
+        self._last: np.ndarray | None = None
+        self._velocity: np.ndarray | None = None  # per-frame change of COORDINATES, per row of _last
+        self._frames_since = 0
+        self._keyframe_gap = 1
+        self._thumbnail: np.ndarray | None = None
+
+    def _thumbnail_of(self, frame: np.ndarray) -> np.ndarray:
+        small = cv2.resize(frame, DIFF_SIZE, interpolation=cv2.INTER_AREA)
+        return cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+
+    def _needs_keyframe(self, thumbnail: np.ndarray) -> bool:
+        if self._last is None or self._frames_since + 1 >= self.cadence.get(self.state(), 1):
+            return True
+        return float(cv2.absdiff(thumbnail, self._thumbnail).mean()) > self.motion_trigger
+
+    def _update_velocity(self, people: np.ndarray) -> None:
+        self._velocity = np.zeros((people.shape[1], len(COORDINATES)), dtype=np.float32)
+        if self._last is None:
+            return
+        # MoveNet reorders people between calls, so pair rows by box overlap before differencing
+        iou = pairwise_iou(people[0, :, PERSON_BOX], self._last[0, :, PERSON_BOX])
+        best = iou.argmax(axis=1)
+        matched = iou[np.arange(len(best)), best] > self.match_iou
+        delta = people[0][:, COORDINATES] - self._last[0][best][:, COORDINATES]
+        self._velocity[matched] = delta[matched] / self._keyframe_gap
+
+    def people(self, frame: np.ndarray, infer: Callable[[], np.ndarray]) -> tuple[np.ndarray, bool]:
+        # -> (people, ran inference)
+        thumbnail = self._thumbnail_of(frame)
+        if self._needs_keyframe(thumbnail):
+            people = infer()
+            self._keyframe_gap = self._frames_since + 1
+            self._update_velocity(people)
+            self._last = people
+            self._thumbnail = thumbnail
+            self._frames_since = 0
+            self.inferred += 1
+            return people, True
+
+        # skipped frame: extrapolate from the last keyframe at constant velocity
+        self._frames_since += 1
+        self.skipped += 1
+        people = self._last.copy()
+        people[0][:, COORDINATES] = np.clip(self._last[0][:, COORDINATES] + self._velocity * self._frames_since, 0, 1)
+        return people, False
+
+    def stats(self) -> dict:
+        total = self.inferred + self.skipped
+        return {"inferred": self.inferred, "skipped": self.skipped,
+                "skip_ratio": round(self.skipped / total, 3) if total else 0.0}
@@ -0,0 +1,234 @@
+import atexit
+import multiprocessing as mp
+import os
+import struct
+import threading
+import time
+from multiprocessing.shared_memory import SharedMemory
+import numpy as np
+
+from constants import (INFERENCE_BACKEND, INFERENCE_THREADS, INFERENCE_WORKER_CPUS, INFERENCE_WORKER_MAX_FRAME,
+                       MOVENET_INPUT_SIZE, MOVENET_MODEL_PATH)
+from events import Level, events
+
+# Shared-memory layout, one block for all slots:
+#   frames   (slots, max_h, max_w, 3) uint8
+#   headers  (slots, 6) int32: frame h, w, then ROI x1, y1, x2, y2 (-1 = full frame)
+#   results  (slots, 6, 56) float32, the worker's MoveNet output
+# The pipe only carries 4-byte slot numbers, so no frame or result is ever pickled.
+HEADER_FIELDS = 6
+RESULT_SHAPE = (6, 56)
+SHUTDOWN = -1
+READY = -2
+FAILED = -3
+
+
+def _pack(value: int) -> bytes:
+    return struct.pack("i", value)
+
+
+def _unpack(message: bytes) -> int:
+    return struct.unpack("i", message)[0]
+
+
+def _ring_size(slots: int, max_frame: tuple[int, int]) -> int:
+    return slots * (max_frame[0] * max_frame[1] * 3 + HEADER_FIELDS * 4 + int(np.prod(RESULT_SHAPE)) * 4)
+
+
+def _ring_views(buffer, slots: int, max_frame: tuple[int, int]) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    frames = np.ndarray((slots, *max_frame, 3), dtype=np.uint8, buffer=buffer)
+    offset = frames.nbytes
+    headers = np.ndarray((slots, HEADER_FIELDS), dtype=np.int32, buffer=buffer, offset=offset)
+    offset += headers.nbytes
+    results = np.ndarray((slots, *RESULT_SHAPE), dtype=np.float32, buffer=buffer, offset=offset)
+    return frames, headers, results
+
+
+def _can_pin() -> bool:
+    if hasattr(os, "sched_setaffinity"):
+        return True
+    try:
+        import psutil
+    except ImportError:
+        return False
+    return hasattr(psutil.Process, "cpu_affinity")
+
+
+def _pin_to_cpus(cpus: tuple[int, ...]) -> None:
+    # sched_setaffinity is Linux-only; psutil covers Windows, where the game actually runs
+    if hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, cpus)
+    else:
+        import psutil
+        psutil.Process().cpu_affinity(list(cpus))
+
+
+def _worker_main(shm_name: str, slots: int, max_frame: tuple[int, int], conn, model_path: str, backend: str,
+                 num_threads: int, cpus: tuple[int, ...]) -> None:
+    if cpus:
+        _pin_to_cpus(cpus)
+
+    from pose_engine import PoseEngine  # TF/ONNX only ever load in the worker
+
+    shm = SharedMemory(name=shm_name)
+    frames, headers, results = _ring_views(shm.buf, slots, max_frame)
+    engine = PoseEngine(model_path, backend=backend, num_threads=num_threads)
+    conn.send_bytes(_pack(READY))
+
+    while True:
+        try:
+            slot = _unpack(conn.recv_bytes())
+        except EOFError:
+            break
+        if slot == SHUTDOWN:
+            break
+
+        h, w, x1, y1, x2, y2 = headers[slot].tolist()
+        frame = frames[slot, :h, :w]
+        try:
+            people = engine.detect(frame) if x1 < 0 else engine.detect_roi(frame, (x1, y1, x2, y2))
+            results[slot] = people[0]
+            reply = slot
+        except Exception as exc:
+            print(f"[ERROR] Pose worker failed on slot {slot}: {exc}")
+            reply = FAILED
+        conn.send_bytes(_pack(reply))
+
+    del frames, headers, results
+    shm.close()
+
+
+class InferenceWorker:
+    # PoseDetector (detect / detect_roi / detect_batch) that runs MoveNet in its own process,
+    # so the model's Python-side dispatch doesn't share a GIL with capture and the HUD
+    def __init__(self, slots: int = 4, max_frame: tuple[int, int] = INFERENCE_WORKER_MAX_FRAME,
+                 cpus: tuple[int, ...] = INFERENCE_WORKER_CPUS, model_path: str = MOVENET_MODEL_PATH,
+                 backend: str = INFERENCE_BACKEND, num_threads: int = INFERENCE_THREADS,
+                 start_timeout: float = 120.0, timeout: float = 10.0, max_restarts: int = 3):
+        self.slots = slots
+        self.max_frame = max_frame
+        self.cpus = cpus
+        if cpus and not _can_pin():
+            events.emit("worker_affinity", Level.WARN, f"⚠️ Can't pin the pose worker to CPUs {list(cpus)} "
+                        "on this platform without psutil, running unpinned", cpus=list(cpus))
+            self.cpus = ()
+        self.model_path = model_path
+        self.backend_name = backend
+        self.num_threads = num_threads
+        self.input_size = MOVENET_INPUT_SIZE
+        self.start_timeout = start_timeout  # first reply includes loading the model
+        self.timeout = timeout
+        self.max_restarts = max_restarts  # per request, before giving up
+        self.restarts = 0
+        self.requests = 0
+        self._shm = SharedMemory(create=True, size=_ring_size(slots, max_frame))
+        self._frames, self._headers, self._results = _ring_views(self._shm.buf, slots, max_frame)
+        self._context = mp.get_context("spawn")  # never fork a process that may hold TF/OpenCV threads
+        self._process = None
+        self._conn = None
+        self._lock = threading.Lock()
+        self._start()
+        atexit.register(self.close)
+
+    def _start(self) -> None:
+        started = time.perf_counter()
+        parent_conn, child_conn = self._context.Pipe()
+        self._process = self._context.Process(
+            target=_worker_main, name="pose-worker", daemon=True,
+            args=(self._shm.name, self.slots, self.max_frame, child_conn, self.model_path,
+                  self.backend_name, self.num_threads, self.cpus))
+        self._process.start()
+        child_conn.close()
+        self._conn = parent_conn
+        if self._receive(self.start_timeout) != READY:
+            raise RuntimeError("Pose worker did not start")
+        cpus = ",".join(map(str, self.cpus)) or "any CPU"
+        print(f"⚙️ Pose worker {self._process.pid} ready in {time.perf_counter() - started:.2f}s on {cpus}")
+
+    def _stop(self) -> None:
+        if self._process is None:
+            return
+        if self._process.is_alive():
+            try:
+                self._conn.send_bytes(_pack(SHUTDOWN))
+            except OSError:
+                pass
+            self._process.join(timeout=2.0)
+            if self._process.is_alive():
+                self._process.kill()
+        self._process.join()
+        self._conn.close()
+        self._process = None
+
+    def _restart(self, reason: str) -> None:
+        self.restarts += 1
+        events.count("worker_restarts")
+        events.emit("worker_restart", Level.WARN, f"⚠️ Pose worker {reason}, restarting", reason=reason)
+        self._stop()
+        self._start()
+
+    def _receive(self, timeout: float) -> int:
+        deadline = time.monotonic() + timeout
+        while not self._conn.poll(0.2):
+            if not self._process.is_alive():
+                raise EOFError(f"exited with code {self._process.exitcode}")
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"no reply in {timeout:.0f}s")
+        return _unpack(self._conn.recv_bytes())
+
+    def _write(self, slot: int, frame: np.ndarray, roi: tuple[int, int, int, int] | None) -> None:
+        h, w = frame.shape[:2]
+        if h > self.max_frame[0] or w > self.max_frame[1]:
+            raise ValueError(f"Frame {w}x{h} is larger than the worker's {self.max_frame[1]}x{self.max_frame[0]} slots")
+        self._frames[slot, :h, :w] = frame
+        self._headers[slot] = (h, w, *(roi if roi is not None else (-1, -1, -1, -1)))
+
+    def _round_trip(self, jobs: list) -> list[np.ndarray]:
+        # fill the slots and hand them over one by one, so the worker starts on slot 0 while the rest copy in
+        for slot, (frame, roi) in enumerate(jobs):
+            self._write(slot, frame, roi)
+            self._conn.send_bytes(_pack(slot))
+        # read every reply before raising, or a failure would leave stale replies for the next request
+        replies = [self._receive(self.timeout) for _ in jobs]
+        if replies != list(range(len(jobs))):
+            raise RuntimeError(f"Pose worker failed on slot(s) {[i for i, r in enumerate(replies) if r != i]}")
+        return [self._results[slot][np.newaxis].copy() for slot in range(len(jobs))]  # slots are reused next request
+
+    def _run(self, jobs: list) -> list[np.ndarray]:
+        results = []
+        with self._lock:
+            for start in range(0, len(jobs), self.slots):
+                chunk = jobs[start:start + self.slots]
+                for attempt in range(self.max_restarts + 1):
+                    try:
+                        results.extend(self._round_trip(chunk))
+                        break
+                    except (EOFError, OSError, TimeoutError) as exc:
+                        if attempt == self.max_restarts:
+                            raise RuntimeError(f"Pose worker kept failing: {exc}") from exc
+                        self._restart(str(exc) or type(exc).__name__)
+            self.requests += len(jobs)
+        return results
+
+    def detect(self, frame: np.ndarray) -> np.ndarray:
+        return self._run([(frame, None)])[0]
+
+    def detect_roi(self, frame: np.ndarray, roi: tuple[int, int, int, int]) -> np.ndarray:
+        return self._run([(frame, roi)])[0]
+
+    def detect_batch(self, frames: list[np.ndarray]) -> list[np.ndarray]:
+        return self._run([(frame, None) for frame in frames])
+
+    def stats(self) -> dict:
+        return {"pid": self._process.pid if self._process is not None else None,
+                "requests": self.requests, "restarts": self.restarts}
+
+    def close(self) -> None:
+        with self._lock:
+            if self._shm is None:
+                return
+            self._stop()
+            del self._frames, self._headers, self._results
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
@@ -1,21 +1,28 @@
 from constants import *
-from player import Player
-from datetime import datetime, timedelta
+from player_table import PlayerTable, PlayerView, PLAYING, WON, LOST
 from random import random
 import cv2
 import numpy as np
 import time
 import math
-import tensorflow as tf
-import tensorflow_hub as hub
+import sys
 
 # Import updated cv_interface functions directly
-from cv_interface import get_player_filters, check_player_movement, check_player_winning, preprocess_frame
-from init_player_faces import extract_faces_from_keypoints
-
-# MoveNet MultiPose model
-movenet = hub.load("https://tfhub.dev/google/movenet/multipose/lightning/1")
-movenet_input_size = 256
+from cv_interface import (get_player_filters, register_players, check_player_movement, check_player_winning,
+                          confirm_players)
+from events import Level, events
+from frame_context import FrameContext
+from inference_scheduler import InferenceScheduler
+from hud import HudCompositor
+from motion import create_motion_detector
+from motion_gate import BackgroundGate
+from motion_thresholds import AdaptiveThresholds
+from pipeline import FramePipeline
+from player_registry import PlayerRegistry
+from roi import RoiPlanner
+from state_timer import DeadlineScheduler
+from tracker import PlayerTracker
+from pose_engine import get_pose_engine
 
 # Start Screen
 class UI:
@@ -31,27 +38,28 @@ class UI:
         else:
             background = cv2.resize(img, (640, 480))
 
+        # the start screen never changes, so draw it once
+        frame = background
+        cv2.putText(frame, "Red Light, Green Light",
+                    (80, 200), cv2.FONT_HERSHEY_SIMPLEX,
+                    1.5, (255, 255, 255), 3, cv2.LINE_AA)
+        cv2.putText(frame, "press ENTER to start",
+                    (170, 300), cv2.FONT_HERSHEY_SIMPLEX,
+                    1.0, (200, 200, 200), 2, cv2.LINE_AA)
+        cv2.putText(frame, "q = quit",
+                    (10, 470), cv2.FONT_HERSHEY_SIMPLEX,
+                    0.7, (255, 255, 255), 2, cv2.LINE_AA)
+        author = "Author: Cal Poly SLO"
+        (tw, _), _ = cv2.getTextSize(author,
+                                      cv2.FONT_HERSHEY_SIMPLEX,
+                                      0.7, 2)
+        cv2.putText(frame, author,
+                    (640 - tw - 10, 470),
+                    cv2.FONT_HERSHEY_SIMPLEX,
+                    0.7, (255, 255, 255), 2, cv2.LINE_AA)
+
+        cv2.imshow(self.window_name, frame)
         while True:
-            frame = background.copy()
-            cv2.putText(frame, "Red Light, Green Light",
-                        (80, 200), cv2.FONT_HERSHEY_SIMPLEX,
-                        1.5, (255, 255, 255), 3, cv2.LINE_AA)
-            cv2.putText(frame, "press ENTER to start",
-                        (170, 300), cv2.FONT_HERSHEY_SIMPLEX,
-                        1.0, (200, 200, 200), 2, cv2.LINE_AA)
-            cv2.putText(frame, "q = quit",
-                        (10, 470), cv2.FONT_HERSHEY_SIMPLEX,
-                        0.7, (255, 255, 255), 2, cv2.LINE_AA)
-            author = "Author: Cal Poly SLO"
-            (tw, _), _ = cv2.getTextSize(author,
-                                          cv2.FONT_HERSHEY_SIMPLEX,
-                                          0.7, 2)
-            cv2.putText(frame, author,
-                        (640 - tw - 10, 470),
-                        cv2.FONT_HERSHEY_SIMPLEX,
-                        0.7, (255, 255, 255), 2, cv2.LINE_AA)
-
-            cv2.imshow(self.window_name, frame)
             key = cv2.waitKey(100) & 0xFF
             if key == 13:  # "enter" key
                 break
@@ -59,14 +67,35 @@ class UI:
         cv2.destroyWindow(self.window_name)
 
 class Game:
-    def __init__(self):
+    def __init__(self, clock=time.monotonic, timeline=None, registry: PlayerRegistry | None = None):
+        self.clock = clock  # replay drives the game on media time instead of the wall clock
+        self.timeline = timeline  # scripted light durations instead of random ones
+        self.registry = registry  # players from earlier rounds, re-matched instead of re-read
         self.state: GameState = GameState.READ_FACES
-        self.players_playing: dict[int, Player] = {}
-        self.players_won: dict[int, Player] = {}
-        self.players_lost: dict[int, Player] = {}
-        self.time_for_next_state = datetime.now()
+        self.players = PlayerTable()
+        self.tracker = PlayerTracker()
+        self.motion_detector = create_motion_detector(MOTION_STRATEGY)
+        self.motion_gate = BackgroundGate() if MOTION_GATE else None
+        self.thresholds = AdaptiveThresholds(self.motion_detector.threshold) if ADAPTIVE_THRESHOLDS else None
+        self.roi_planner = RoiPlanner() if ROI_INFERENCE else None
+        self.scheduler = InferenceScheduler(lambda: self.state) if KEYFRAME_INFERENCE else None
+        self.deadlines = DeadlineScheduler()
         self.cap = None  # Camera will be initialized in run()
         self.start_time = time.time() # for pulsing red light phase
+        self.hud = HudCompositor()
+        self.window_name = 'Live Feed'
+
+    @property
+    def players_playing(self) -> dict[int, PlayerView]:
+        return self.players.players(PLAYING)
+
+    @property
+    def players_won(self) -> dict[int, PlayerView]:
+        return self.players.players(WON)
+
+    @property
+    def players_lost(self) -> dict[int, PlayerView]:
+        return self.players.players(LOST)
 
     def run(self) -> None:
         self.cap = cv2.VideoCapture(0, cv2.CAP_DSHOW)
@@ -75,134 +104,194 @@ class Game:
             return
 
         while True:
-            ret, frame = self.cap.read()
-            if not ret or frame is None:
+            ctx = FrameContext.capture(self.cap, roi_planner=self.roi_planner, scheduler=self.scheduler)
+            if ctx is None:
                 print("❌ Failed to grab frame")
                 break
 
-            match self.state:
-                case GameState.READ_FACES:
-                    self.read_faces()
-                case GameState.GREEN_LIGHT:
-                    self.green_light()
-                case GameState.RED_LIGHT:
-                    self.red_light()
-                case GameState.END_GAME:
-                    self.end_game()
-                    break
-
-            border_color = STATE_COLORS[self.state]
-            height, width = frame.shape[:2]
-
-            # draw border and text
-            cv2.rectangle(frame, (0, 0), (width - 1, height - 1), border_color.value, thickness=10)
-            cv2.putText(frame, f"State: {self.state.name}", (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 1, border_color.value, 2)
-
-            if self.state in [GameState.RED_LIGHT, GameState.GREEN_LIGHT]:
-                time_remaining_str = str(self.time_for_next_state - datetime.now())
-                cv2.putText(frame, f"{time_remaining_str[time_remaining_str.index(':') + 1:]}", (10, 60),
-                            cv2.FONT_HERSHEY_SIMPLEX, 1, border_color.value, 2)
-
-            cv2.putText(frame, f"Players: {len(self.players_playing)}", (10, height - 20),
-                        cv2.FONT_HERSHEY_SIMPLEX, 1, border_color.value, 2)
-
-            # show current game state as a traffic light
-            light_w, light_h = 60, 140
-            margin = 20
-            x0 = width - light_w - margin
-            y0 = margin
-
-            # background box
-            cv2.rectangle(frame, (x0, y0), (x0 + light_w, y0 + light_h), (50, 50, 50), -1)
-
-            # circle parameters
-            radius = (light_w // 2) - 10
-            cx = x0 + light_w // 2
-            red_y = y0 + radius + 10
-            green_y = y0 + light_h - radius - 10
-            dark = (30, 30, 30)
-
-            # light on/off
-            if self.state == GameState.GREEN_LIGHT:
-                cv2.circle(frame, (cx, red_y), radius, dark, -1)  # red off
-                cv2.circle(frame, (cx, green_y), radius, (0, 255, 0), -1)  # green on
-            else:
-                cv2.circle(frame, (cx, red_y), radius, (0, 0, 255), -1)  # red on
-                cv2.circle(frame, (cx, green_y), radius, dark, -1)  # green off
-
-            # pulsing red light phase
-            if self.state == GameState.RED_LIGHT:
-                alpha = 0.2 + 0.1 * math.sin(2 * math.pi * (time.time() - self.start_time))
-                overlay = np.full(frame.shape, (0, 0, 255), dtype=np.uint8)  # BGR: red
-                cv2.addWeighted(overlay, alpha, frame, 1.0 - alpha, 0, frame)
-
-            cv2.imshow('Live Feed', frame)
-
-            # Temp key listeners for quitting or ending
-            key = cv2.waitKey(1) & 0xFF
-            if key == ord('q'):
+            if not self.tick(ctx):
                 break
-            elif key == ord('e'):
-                print("🔚 Forcing end game...")
-                self.state = GameState.END_GAME
 
         self.cap.release()
         cv2.destroyAllWindows()
 
-    def read_faces(self) -> None:
-        print("🔍 Reading player filters...")
-        self.players_playing = get_player_filters(self.cap)
-        print(f"✅ Loaded {len(self.players_playing)} player(s)")
-        self.to_green_light_state()
-
-    def update_faces(self):
-        ret, frame = self.cap.read()
-        if not ret:
+    def run_pipelined(self) -> None:
+        self.cap = cv2.VideoCapture(0, cv2.CAP_DSHOW)
+        if not self.cap.isOpened():
+            print("❌ Could not open video capture")
             return
 
-        input_img = preprocess_frame(frame)
-        outputs = movenet.signatures["serving_default"](tf.constant(input_img))
-        people = outputs["output_0"].numpy()
-        faces_with_sizes = extract_faces_from_keypoints(frame, people)
+        # registration drives the camera itself, so finish it before the capture thread takes over
+        if self.state == GameState.READ_FACES:
+            self.read_faces()
 
-        if not faces_with_sizes:
-            return  # No faces detected; skip update
+        pipeline = FramePipeline(self.cap, roi_planner=self.roi_planner, scheduler=self.scheduler)
+        pipeline.run(self.tick)
+        print(f"📊 Pipeline stats: {pipeline.stats()}")
 
-        # explicitly handle unpacking
-        for face_data, player in zip(faces_with_sizes, self.players_playing.values()):
-            if len(face_data) == 2:
-                face, size = face_data
-                player.update_face_size(size)
-            else:
-                print("Warning: Unexpected face_data structure:", face_data)
+        self.cap.release()
+        cv2.destroyAllWindows()
+
+    def tick(self, ctx: FrameContext) -> bool:
+        started = time.perf_counter()
+        if not self.step(ctx):
+            return False
+        stepped = time.perf_counter()
+
+        frame = self.render_hud(ctx)
+        cv2.imshow(self.window_name, frame)
+
+        events.count("frames")
+        events.timing("step", stepped - started)
+        events.timing("render", time.perf_counter() - stepped)
+        events.timing("capture_to_display", ctx.age_seconds)
+
+        # Temp key listeners for quitting or ending
+        key = cv2.waitKey(1) & 0xFF
+        if key == ord('q'):
+            return False
+        elif key == ord('e'):
+            print("🔚 Forcing end game...")
+            self.state = GameState.END_GAME
+        return True
+
+    def step(self, ctx: FrameContext) -> bool:
+        match self.state:
+            case GameState.READ_FACES:
+                self.read_faces()
+            case GameState.CALIBRATE:
+                self.calibrate(ctx)
+            case GameState.GREEN_LIGHT:
+                self.green_light(ctx)
+            case GameState.RED_LIGHT:
+                self.red_light(ctx)
+            case GameState.END_GAME:
+                self.end_game()
+                return False
+        return True
+
+    def render_hud(self, ctx: FrameContext) -> np.ndarray:
+        time_remaining = None
+        if self.state in [GameState.CALIBRATE, GameState.RED_LIGHT, GameState.GREEN_LIGHT]:
+            time_remaining = self.hud.countdown(self.deadlines.remaining(ctx.captured_at))
+
+        pulse_alpha = None
+        if self.state == GameState.RED_LIGHT:
+            pulse_alpha = 0.2 + 0.1 * math.sin(2 * math.pi * (time.time() - self.start_time))
+
+        return self.hud.render(ctx.frame, self.state, time_remaining, self.players.count(PLAYING), pulse_alpha)
 
-    def green_light(self):
-        self.update_faces()
+    def read_faces(self) -> None:
+        self.register_faces()
+        self.after_registration()
+
+    def register_faces(self) -> None:
+        # registration only; the light timeline starts in after_registration()
+        players = {}
+        if self.registry is not None and self.registry.exists():
+            print("🔁 Re-matching known players...")
+            ctx = FrameContext.capture(self.cap)
+            if ctx is not None:
+                players, boxes = self.registry.rematch(ctx.frame, ctx.people, self.tracker)
+                if players and not confirm_players(ctx.frame, players, boxes):
+                    players = {}
+                    self.tracker.retain([])  # drop the rejected matches' tracks
+        if not players:
+            print("🔍 Reading player filters...")
+            players = get_player_filters(self.cap, self.tracker)
+        self.players = PlayerTable.from_players(players)
+        print(f"✅ Loaded {len(self.players)} player(s)")
+
+    def read_faces_from(self, ctx: FrameContext) -> None:
+        # headless registration: everyone detected in this frame becomes a player
+        players, _ = register_players(ctx.frame, ctx.people, self.tracker)
+        self.players = PlayerTable.from_players(players)
+        print(f"✅ Loaded {len(self.players)} player(s)")
+        self.after_registration()
+
+    def after_registration(self) -> None:
+        # a replay script without a CALIBRATE entry was recorded without that stage, so don't insert one
+        if self.thresholds is not None and (self.timeline is None or self.timeline.expects(GameState.CALIBRATE)):
+            self.to_calibrate_state()
+        else:
+            self.to_green_light_state()
 
-        if self.time_for_next_state < datetime.now() and self.players_playing:
-            self.to_red_light_state()
+    def update_faces(self, ctx: FrameContext):
+        player_ids, sizes = [], []
+        for player_id in self.players.ids_with_status(PLAYING).tolist():
+            detection = ctx.player_detection(player_id, box_policy="shoulder")
+            if detection is None:
+                continue  # Player not matched this frame; keep last size
+
+            _, (x1, y1, x2, y2) = detection
+            player_ids.append(player_id)
+            sizes.append(y2 - y1)
+
+        if player_ids:
+            self.players.set_face_sizes(player_ids, sizes)
+
+    def track_players(self, ctx: FrameContext) -> None:
+        self.tracker.retain(self.players.ids_with_status(PLAYING).tolist())
+        ctx.assignments = self.tracker.update(ctx.people, ctx.frame.shape)
+        if self.roi_planner is not None:
+            self.roi_planner.update(self.tracker.active_boxes())
+
+        if ctx.assignments:
+            h, w = ctx.frame.shape[:2]
+            rows = list(ctx.assignments.values())
+            keypoints = ctx.people[0, rows, :51].reshape(-1, 17, 3) * (h, w, 1)
+            self.players.set_keypoints(list(ctx.assignments), keypoints)
+
+    def calibrate(self, ctx: FrameContext):
+        # everyone holds still: whatever the motion detector reports now is each player's noise
+        self.track_players(ctx)
+        self.update_faces(ctx)
+
+        player_ids, scores = self.motion_detector.scores(ctx, self.players)
+        if len(player_ids):
+            self.thresholds.observe_still(player_ids, scores, self.players.face_size[self.players.slots(player_ids)])
+
+        if self.deadlines.due(ctx.captured_at):
+            self.thresholds.calibrate()
+            self.to_green_light_state(ctx.captured_at)
+
+    def green_light(self, ctx: FrameContext):
+        self.track_players(ctx)
+        self.update_faces(ctx)
+
+        if self.deadlines.due(ctx.captured_at) and self.players.count(PLAYING):
+            self.to_red_light_state(ctx.captured_at)
         else:
-            check_player_winning(self.players_playing, self.players_won)
+            check_player_winning(self.players)
 
-        if not self.players_playing:
+        if not self.players.count(PLAYING):
             self.state = GameState.END_GAME
 
-    def red_light(self):
-        self.update_faces()
+    def red_light(self, ctx: FrameContext):
+        # nobody's box changed against the red-light background: no pose inference, nothing to judge.
+        # Poses already computed (pipelined capture, multi-arena batches) are always used.
+        inferred = (self.motion_gate is None or ctx.inferred
+                    or self.motion_gate.should_infer(ctx, self.tracker.active_boxes()))
+        if inferred:
+            self.track_players(ctx)
+            self.update_faces(ctx)
+        else:
+            events.count("inferences_saved")
 
-        if self.time_for_next_state < datetime.now() and self.players_playing:
-            self.to_green_light_state()
+        if self.deadlines.due(ctx.captured_at) and self.players.count(PLAYING):
+            self.to_green_light_state(ctx.captured_at)
         else:
-            check_player_movement(self.cap, self.players_playing, self.players_lost)
-            check_player_winning(self.players_playing, self.players_won)
+            if inferred and self.deadlines.judging(ctx.captured_at):
+                check_player_movement(ctx, self.players, self.motion_detector, self.thresholds)
+            check_player_winning(self.players)
 
-        if not self.players_playing:
+        if not self.players.count(PLAYING):
             self.state = GameState.END_GAME
 
     def end_game(self):
-        print("🎉 Game over!")
-        print(f"🏁 Winners: {[p.id for p in self.players_won.values()]}")
-        print(f"❌ Eliminated: {[p.id for p in self.players_lost.values()]}")
+        self.report_results()
+        if self.registry is not None and len(self.players):
+            self.registry.save(self.players)
         print("Press 'q' to exit...")
         
         while True:
@@ -210,30 +299,71 @@ class Game:
             if key.lower() == 'q':
                 break
 
-    def to_green_light_state(self) -> None:
-        self.set_time_for_next_state_green()
+    def report_results(self) -> None:
+        events.emit("state", Level.INFO, state=GameState.END_GAME.name,
+                    winners=self.players.ids_with_status(WON).tolist(), eliminated=self.players.ids_with_status(LOST).tolist())
+        events.flush()
+        print(f"📊 Metrics: {events.metrics()}")
+        print(f"⏱️ Transitions: {self.deadlines.stats()}")
+        if self.motion_gate is not None:
+            print(f"🚦 Motion gate: {self.motion_gate.stats()}")
+        print("🎉 Game over!")
+        print(f"🏁 Winners: {[p.id for p in self.players_won.values()]}")
+        print(f"❌ Eliminated: {[p.id for p in self.players_lost.values()]}")
+
+    def to_calibrate_state(self) -> None:
+        duration = self.timeline.duration(GameState.CALIBRATE) if self.timeline is not None else CALIBRATION_SECONDS
+        self.schedule(GameState.CALIBRATE, duration, None)
+        self.motion_detector.reset()  # reference pose = first calibration frame
+        self.thresholds.reset()
+        self.state = GameState.CALIBRATE
+        events.emit("state", Level.INFO, "🧍 Calibrating: everyone stand still...", state=self.state.name)
+
+    def to_green_light_state(self, at: float | None = None) -> None:
+        self.set_time_for_next_state_green(at)
         self.state = GameState.GREEN_LIGHT
-        print(f"🎮 Transitioned to state: {self.state}")
+        events.emit("state", Level.INFO, f"🎮 Transitioned to state: {self.state}", state=self.state.name)
 
-    def to_red_light_state(self) -> None:
-        self.set_time_for_next_state_red()
+    def to_red_light_state(self, at: float | None = None) -> None:
+        self.set_time_for_next_state_red(at)
+        self.motion_detector.reset()  # new reference pose for this red light
+        if self.motion_gate is not None:
+            self.motion_gate.reset()  # and a new background
         self.state = GameState.RED_LIGHT
-        print(f"🎮 Transitioned to state: {self.state}")
+        events.emit("state", Level.INFO, f"🎮 Transitioned to state: {self.state}", state=self.state.name)
 
-    def set_time_for_next_state_green(self) -> None:
-        duration = random() * GREEN_LIGHT_TIME_RANGE_SECONDS + GREEN_LIGHT_TIME_MIN_SECONDS
-        self.time_for_next_state = datetime.now() + timedelta(seconds=duration)
+    def set_time_for_next_state_green(self, at: float | None = None) -> None:
+        if self.timeline is not None:
+            duration = self.timeline.duration(GameState.GREEN_LIGHT)
+        else:
+            duration = random() * GREEN_LIGHT_TIME_RANGE_SECONDS + GREEN_LIGHT_TIME_MIN_SECONDS
+        self.schedule(GameState.GREEN_LIGHT, duration, at)
 
-    def set_time_for_next_state_red(self) -> None:
-        self.time_for_next_state = datetime.now() + timedelta(seconds=RED_LIGHT_TIME_SECONDS)
+    def set_time_for_next_state_red(self, at: float | None = None) -> None:
+        if self.timeline is not None:
+            duration = self.timeline.duration(GameState.RED_LIGHT)
+        else:
+            duration = RED_LIGHT_TIME_SECONDS
+        self.schedule(GameState.RED_LIGHT, duration, at)
+
+    def schedule(self, state: GameState, duration: float, at: float | None) -> None:
+        # at = capture time of the frame that hit the deadline; None starts a fresh timeline
+        if at is None:
+            self.deadlines.start(state, duration, self.clock())
+        else:
+            self.deadlines.advance(state, duration, at)
 
 
 def main() -> None:
+    get_pose_engine()  # load MoveNet once, before the start screen
     ui = UI(window_name="Live Feed")  # create the UI
     ui.show_start_screen()  # show start screen
-    game = Game()
+    game = Game(registry=PlayerRegistry(PLAYER_REGISTRY_PATH) if PLAYER_REGISTRY_PATH else None)
     game.ui = ui
-    game.run()
+    if "--pipelined" in sys.argv:
+        game.run_pipelined()
+    else:
+        game.run()
 
 
 if __name__ == '__main__':
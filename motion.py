@@ -0,0 +1,92 @@
+import numpy as np
+
+from cv_interface import LEFT_SHOULDER, RIGHT_SHOULDER
+from frame_context import FrameContext
+from player import MOVING_SCORE_THRESHOLD
+from player_table import PLAYING, PlayerTable
+
+
+class MotionDetector:
+    # Scores how much each matched, still-playing player moved this frame; above `threshold` counts as moving
+    name = "base"
+    threshold = 0.0
+
+    def reset(self) -> None:
+        pass
+
+    def scores(self, ctx: FrameContext, table: PlayerTable) -> tuple[np.ndarray, np.ndarray]:
+        # -> (player ids, scores)
+        raise NotImplementedError
+
+def matched_players(ctx: FrameContext, table: PlayerTable) -> list[int]:
+    playing = set(table.ids_with_status(PLAYING).tolist())
+    return [pid for pid in ctx.assignments if pid in playing]
+
+
+class PixelDiffMotion(MotionDetector):
+    # Original method: mean absolute difference of the face crop against the registration face
+    name = "pixel"
+
+    def __init__(self, threshold: float = MOVING_SCORE_THRESHOLD):
+        self.threshold = threshold
+
+    def scores(self, ctx: FrameContext, table: PlayerTable) -> tuple[np.ndarray, np.ndarray]:
+        ids, faces = [], []
+        for player_id in matched_players(ctx, table):
+            detection = ctx.player_detection(player_id, box_policy="fixed")
+            if detection is not None:
+                ids.append(player_id)
+                faces.append(detection[0])
+        if not ids:
+            return np.zeros(0, dtype=np.int32), np.zeros(0)
+
+        slots = table.slots(ids)
+        diff = np.abs(np.stack(faces).astype(np.int16) - table.face_templates[slots].astype(np.int16))
+        scores = diff.mean(axis=(1, 2))
+        has_template = table.has_template[slots]
+        return np.array(ids, dtype=np.int32)[has_template], scores[has_template]
+
+
+class KeypointMotion(MotionDetector):
+    # Mean keypoint displacement since the start of this red light, in shoulder widths
+    name = "keypoint"
+
+    def __init__(self, threshold: float = 0.15, keypoint_threshold: float = 0.3, min_shoulder_width: float = 20.0):
+        self.threshold = threshold
+        self.keypoint_threshold = keypoint_threshold
+        self.min_shoulder_width = min_shoulder_width
+        self.baselines: dict[int, np.ndarray] = {}  # player id -> (17, [y, x, score]) in pixels
+
+    def reset(self) -> None:
+        self.baselines.clear()
+
+    def scores(self, ctx: FrameContext, table: PlayerTable) -> tuple[np.ndarray, np.ndarray]:
+        ids = matched_players(ctx, table)
+        if not ids:
+            return np.zeros(0, dtype=np.int32), np.zeros(0)
+
+        current = table.keypoints[table.slots(ids)]  # refreshed from this frame by Game.track_players
+
+        # first sighting after the light turned red becomes that player's reference pose
+        for player_id, keypoints in zip(ids, current):
+            self.baselines.setdefault(player_id, keypoints)
+        baseline = np.stack([self.baselines[pid] for pid in ids])
+
+        displacement = np.linalg.norm(current[:, :, :2] - baseline[:, :, :2], axis=2)
+        valid = (current[:, :, 2] >= self.keypoint_threshold) & (baseline[:, :, 2] >= self.keypoint_threshold)
+        mean_displacement = (displacement * valid).sum(axis=1) / np.maximum(valid.sum(axis=1), 1)
+
+        shoulders = baseline[:, [LEFT_SHOULDER, RIGHT_SHOULDER], :2]
+        shoulder_width = np.maximum(np.linalg.norm(shoulders[:, 0] - shoulders[:, 1], axis=1), self.min_shoulder_width)
+        return np.array(ids, dtype=np.int32), mean_displacement / shoulder_width
+
+
+MOTION_DETECTORS = {
+    PixelDiffMotion.name: PixelDiffMotion,
+    KeypointMotion.name: KeypointMotion,
+}
+
+def create_motion_detector(name: str) -> MotionDetector:
+    if name not in MOTION_DETECTORS:
+        raise ValueError(f"Unknown motion strategy: {name} (choose from {', '.join(MOTION_DETECTORS)})")
+    return MOTION_DETECTORS[name]()
@@ -0,0 +1,66 @@
+import cv2
+import numpy as np
+
+from frame_context import FrameContext
+
+GATE_SIZE = (160, 120)  # background model runs on a small grayscale frame
+
+
+class BackgroundGate:
+    # Cheap per-pixel pre-filter for red light. A running-average background, seeded when the light turns
+    # red, is compared with each frame. Pose inference only runs when some tracked player's box has enough
+    # changed pixels. Motion energy = fraction of changed pixels inside the box.
+    def __init__(self, threshold: float = 0.02, pixel_threshold: float = 20.0, learning_rate: float = 0.02,
+                 refresh_every: int = 10, size: tuple[int, int] = GATE_SIZE):
+        self.threshold = threshold
+        self.pixel_threshold = pixel_threshold  # gray-level change (0-255) that marks a pixel as changed
+        self.learning_rate = learning_rate  # slow, so a player creeping forward still stands out
+        self.refresh_every = refresh_every  # run inference at least this often regardless
+        self.size = size
+        self.background: np.ndarray | None = None
+        self.frames_since_inference = 0
+        self.checked = 0
+        self.saved = 0
+
+    def reset(self) -> None:
+        self.background = None
+        self.frames_since_inference = 0
+
+    def energies(self, frame: np.ndarray, boxes) -> np.ndarray:
+        # (x1, y1, x2, y2) pixel boxes -> motion energy per box
+        small = cv2.cvtColor(cv2.resize(frame, self.size, interpolation=cv2.INTER_AREA), cv2.COLOR_BGR2GRAY)
+        small = small.astype(np.float32)
+        if self.background is None:
+            self.background = small
+            return np.full(len(boxes), np.inf)
+
+        changed = (cv2.absdiff(small, self.background) > self.pixel_threshold).astype(np.uint8)
+        cv2.accumulateWeighted(small, self.background, self.learning_rate)
+        if not len(boxes):
+            return np.zeros(0)
+
+        # box sums from one integral image instead of a slice per box
+        integral = cv2.integral(changed)
+        h, w = frame.shape[:2]
+        sx, sy = self.size[0] / w, self.size[1] / h
+        scaled = np.asarray(boxes, dtype=np.float32).reshape(-1, 4) * (sx, sy, sx, sy)
+        x1, y1, x2, y2 = np.round(scaled).astype(int).T
+        x1, x2 = np.clip(x1, 0, self.size[0]), np.clip(x2, 0, self.size[0])
+        y1, y2 = np.clip(y1, 0, self.size[1]), np.clip(y2, 0, self.size[1])
+        counts = integral[y2, x2] - integral[y1, x2] - integral[y2, x1] + integral[y1, x1]
+        areas = (x2 - x1) * (y2 - y1)
+        return np.where(areas > 0, counts / np.maximum(areas, 1), 0.0)
+
+    def should_infer(self, ctx: FrameContext, boxes) -> bool:
+        self.checked += 1
+        energies = self.energies(ctx.frame, boxes)
+        self.frames_since_inference += 1
+        if not len(boxes) or self.frames_since_inference >= self.refresh_every or (energies > self.threshold).any():
+            self.frames_since_inference = 0
+            return True
+        self.saved += 1
+        return False
+
+    def stats(self) -> dict:
+        return {"checked": self.checked, "inferences_saved": self.saved,
+                "saved_ratio": round(self.saved / self.checked, 3) if self.checked else 0.0}
@@ -0,0 +1,86 @@
+import numpy as np
+
+from events import Level, events
+from player import MOVING_FRAMES_TO_ELIMINATE
+
+
+class AdaptiveThresholds:
+    # Per-player motion thresholds from each player's own standing-still noise. Calibration records the
+    # scores of players told to hold still; the threshold is mean + `sigmas` std of that noise, scaled by
+    # how far the player is now compared to then. It keeps learning from clearly-still red-light frames.
+    # Only a player whose threshold is at most `fast_confirm_fraction` of the detector's fixed one, i.e.
+    # whose noise is far below any real movement, is eliminated after `confirm_frames` instead of the usual streak.
+    def __init__(self, default_threshold: float, sigmas: float = 4.0, min_fraction: float = 0.25,
+                 min_samples: int = 5, confirm_frames: int = 2, fast_confirm_fraction: float = 0.5,
+                 learning_rate: float = 0.02, distance_exponent: float = 1.0, max_scale: float = 2.0):
+        self.default_threshold = default_threshold
+        self.sigmas = sigmas
+        self.min_threshold = min_fraction * default_threshold  # even a perfectly steady player gets some slack
+        self.min_samples = min_samples
+        self.confirm_frames = confirm_frames
+        self.fast_confirm_threshold = fast_confirm_fraction * default_threshold
+        self.learning_rate = learning_rate
+        self.distance_exponent = distance_exponent
+        self.max_scale = max_scale
+        self.samples: dict[int, list[tuple[float, int]]] = {}  # player id -> (score, face size) while calibrating
+        self.noise: dict[int, tuple[float, float, float]] = {}  # player id -> (mean, variance, reference face size)
+
+    def reset(self) -> None:
+        self.samples.clear()
+        self.noise.clear()
+
+    def observe_still(self, player_ids, scores: np.ndarray, face_sizes: np.ndarray) -> None:
+        for player_id, score, size in zip(np.asarray(player_ids).tolist(), scores.tolist(), face_sizes.tolist()):
+            if player_id not in self.samples:
+                # first sighting is the reference frame of baseline-relative detectors (score exactly 0), not noise
+                self.samples[player_id] = []
+                continue
+            self.samples[player_id].append((score, size))
+
+    def calibrate(self) -> None:
+        for player_id, samples in self.samples.items():
+            if len(samples) < self.min_samples:
+                events.emit("calibration", Level.WARN, f"⚠️ Player {player_id} barely seen while calibrating, "
+                            "using the default threshold", player=player_id, samples=len(samples))
+                continue
+            scores, sizes = np.array(samples, dtype=np.float64).T
+            self.noise[player_id] = (float(scores.mean()), float(scores.var()), float(np.median(sizes)))
+            events.emit("calibration", Level.INFO, f"🎯 Player {player_id} calibrated", player=player_id, samples=len(samples),
+                        threshold=round(self._base(player_id), 4))
+        self.samples.clear()
+
+    def _base(self, player_id: int) -> float:
+        mean, variance, _ = self.noise[player_id]
+        return mean + self.sigmas * np.sqrt(variance)
+
+    def _scale(self, player_id: int, face_size: float) -> float:
+        # detection noise grows as a player gets smaller in frame, and shrinks as they approach
+        reference = self.noise[player_id][2]
+        if reference <= 0 or face_size <= 0:
+            return 1.0
+        return float(np.clip((reference / face_size) ** self.distance_exponent, 1 / self.max_scale, self.max_scale))
+
+    def limits(self, player_ids, face_sizes: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        # -> (score threshold, frames to eliminate) per player
+        thresholds = np.full(len(player_ids), self.default_threshold, dtype=np.float64)
+        frames = np.full(len(player_ids), MOVING_FRAMES_TO_ELIMINATE, dtype=np.int32)
+        for i, (player_id, size) in enumerate(zip(np.asarray(player_ids).tolist(), face_sizes.tolist())):
+            if player_id not in self.noise:
+                continue
+            thresholds[i] = max(self._base(player_id) * self._scale(player_id, size), self.min_threshold)
+            if thresholds[i] <= self.fast_confirm_threshold:
+                frames[i] = self.confirm_frames
+        return thresholds, frames
+
+    def update(self, player_ids, scores: np.ndarray, face_sizes: np.ndarray) -> None:
+        # online drift tracking (lighting, camera warming up), only from frames that are clearly still
+        for player_id, score, size in zip(np.asarray(player_ids).tolist(), scores.tolist(), face_sizes.tolist()):
+            if player_id not in self.noise:
+                continue
+            mean, variance, reference = self.noise[player_id]
+            score /= self._scale(player_id, size)  # back to the calibration distance
+            if score > mean + 2 * np.sqrt(variance):
+                continue
+            mean += self.learning_rate * (score - mean)
+            variance += self.learning_rate * ((score - mean) ** 2 - variance)
+            self.noise[player_id] = (mean, variance, reference)
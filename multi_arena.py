@@ -0,0 +1,107 @@
+import sys
+import time
+
+import cv2
+
+from constants import GameState
+from events import events
+from frame_context import FrameContext
+from main import Game
+from pose_engine import PoseDetector, get_pose_engine
+
+INFERRED_STATES = (GameState.CALIBRATE, GameState.GREEN_LIGHT, GameState.RED_LIGHT)
+
+
+class Arena:
+    # One field: its own camera, window and Game state machine
+    def __init__(self, name: str, source: str | int):
+        self.name = name
+        self.source = source
+        self.game = Game()
+        self.game.window_name = name
+        # frames are batched across arenas at a fixed input size, so no per-arena crops or skipping
+        self.game.roi_planner = None
+        self.game.scheduler = None
+        self.cap = None
+        self.finished = False
+
+    def open(self) -> bool:
+        self.cap = cv2.VideoCapture(self.source)
+        if not self.cap.isOpened():
+            print(f"❌ [{self.name}] Could not open video capture {self.source}")
+            return False
+        return True
+
+    def finish(self) -> None:
+        if not self.finished:
+            print(f"🏟️ [{self.name}] finished")
+            self.game.report_results()
+            self.finished = True
+            self.cap.release()
+
+
+class MultiArenaRunner:
+    # Drives several games round-robin from one process, with one shared pose engine
+    def __init__(self, sources: list[str | int], engine: PoseDetector | None = None):
+        self.arenas = [Arena(f"Arena {i + 1}", source) for i, source in enumerate(sources)]
+        self.engine = engine
+        self.rounds = 0
+        self.batched_frames = 0
+
+    def run(self) -> None:
+        engine = self.engine or get_pose_engine()
+        arenas = [arena for arena in self.arenas if arena.open()]
+
+        # registration needs an operator at each field; do them one after another
+        for arena in arenas:
+            arena.game.cap = arena.cap
+            print(f"🏟️ [{arena.name}] registering players")
+            arena.game.register_faces()
+
+        # start every timeline together, so no arena's light runs while the others are still registering
+        for arena in arenas:
+            arena.game.after_registration()
+
+        started = time.perf_counter()
+        while arenas:
+            contexts = []
+            for arena in arenas:
+                ctx = FrameContext.capture(arena.cap, engine)
+                if ctx is None:
+                    print(f"❌ [{arena.name}] Failed to grab frame")
+                    arena.finish()
+                else:
+                    contexts.append((arena, ctx))
+
+            # one batched inference for every arena that is judging this round
+            judged = [(arena, ctx) for arena, ctx in contexts if arena.game.state in INFERRED_STATES]
+            if judged:
+                for (_, ctx), people in zip(judged, engine.detect_batch([ctx.frame for _, ctx in judged])):
+                    ctx.provide_people(people)
+                self.batched_frames += len(judged)
+
+            for arena, ctx in contexts:
+                if arena.game.state == GameState.END_GAME or not arena.game.tick(ctx):
+                    arena.finish()
+
+            arenas = [arena for arena in arenas if not arena.finished]
+            self.rounds += 1
+            events.timing("arena_round", time.perf_counter() - started)
+            started = time.perf_counter()
+
+        cv2.destroyAllWindows()
+
+    def stats(self) -> dict:
+        return {"arenas": len(self.arenas), "rounds": self.rounds, "batched_frames": self.batched_frames}
+
+
+def main() -> None:
+    # python multi_arena.py 0 1 rtsp://camera-3/stream
+    sources = [int(arg) if arg.isdigit() else arg for arg in sys.argv[1:]] or [0]
+    runner = MultiArenaRunner(sources)
+    runner.run()
+    print(f"📊 Multi-arena stats: {runner.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+import threading
+import time
+from collections import deque
+from typing import Callable
+
+from frame_context import FrameContext
+from inference_scheduler import InferenceScheduler
+from pose_engine import PoseDetector
+from roi import RoiPlanner
+
+
+class LatestQueue:
+    # Bounded hand-off between stages; when full the oldest item is dropped so consumers see the freshest frame
+    def __init__(self, maxsize: int = 1):
+        self._items: deque = deque(maxlen=maxsize)
+        self._cond = threading.Condition()
+        self.dropped = 0
+
+    def put(self, item) -> None:
+        with self._cond:
+            if len(self._items) == self._items.maxlen:
+                self.dropped += 1
+            self._items.append(item)
+            self._cond.notify()
+
+    def get(self, timeout: float | None = None):
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._items, timeout):
+                return None
+            return self._items.popleft()
+
+    @property
+    def depth(self) -> int:
+        return len(self._items)
+
+
+class StageStats:
+    def __init__(self, name: str, smoothing: float = 0.1):
+        self.name = name
+        self.smoothing = smoothing
+        self.frames = 0
+        self.fps = 0.0
+        self.latency_ms = 0.0  # capture -> end of this stage
+        self._last_tick: float | None = None
+
+    def tick(self, captured_at: float | None = None) -> None:
+        now = time.monotonic()
+        if self._last_tick is not None and now > self._last_tick:
+            fps = 1.0 / (now - self._last_tick)
+            self.fps = fps if self.fps == 0 else self.fps + self.smoothing * (fps - self.fps)
+        if captured_at is not None:
+            latency = (now - captured_at) * 1000
+            self.latency_ms = latency if self.frames == 0 else self.latency_ms + self.smoothing * (latency - self.latency_ms)
+        self._last_tick = now
+        self.frames += 1
+
+    def as_dict(self) -> dict:
+        return {"frames": self.frames, "fps": round(self.fps, 1), "latency_ms": round(self.latency_ms, 1)}
+
+
+class FramePipeline:
+    # capture thread -> inference worker -> caller's render loop
+    def __init__(self, cap, engine: PoseDetector | None = None, queue_size: int = 1,
+                 roi_planner: RoiPlanner | None = None, scheduler: InferenceScheduler | None = None):
+        self.cap = cap
+        self.engine = engine
+        self.roi_planner = roi_planner
+        self.scheduler = scheduler
+        self.captured = LatestQueue(queue_size)
+        self.inferred = LatestQueue(queue_size)
+        self.capture_stats = StageStats("capture")
+        self.inference_stats = StageStats("inference")
+        self.render_stats = StageStats("render")
+        self._running = threading.Event()
+        self._threads: list[threading.Thread] = []
+
+    def _capture_loop(self) -> None:
+        while self._running.is_set():
+            ctx = FrameContext.capture(self.cap, self.engine, self.roi_planner, self.scheduler)
+            if ctx is None:
+                print("❌ Failed to grab frame")
+                self._running.clear()
+                break
+            self.captured.put(ctx)
+            self.capture_stats.tick(ctx.captured_at)
+
+    def _inference_loop(self) -> None:
+        while self._running.is_set():
+            ctx = self.captured.get(timeout=0.1)
+            if ctx is None:
+                continue
+            self.inferred.put(ctx.prepare())
+            self.inference_stats.tick(ctx.captured_at)
+
+    def start(self) -> None:
+        self._running.set()
+        self._threads = [
+            threading.Thread(target=self._capture_loop, name="capture", daemon=True),
+            threading.Thread(target=self._inference_loop, name="inference", daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self) -> None:
+        self._running.clear()
+        for thread in self._threads:
+            thread.join(timeout=1.0)
+        self._threads = []
+
+    def run(self, on_frame: Callable[[FrameContext], bool]) -> None:
+        # on_frame runs on the calling thread (OpenCV windows must stay there); return False to stop
+        self.start()
+        try:
+            while self._running.is_set() or self.inferred.depth:
+                ctx = self.inferred.get(timeout=0.1)
+                if ctx is None:
+                    continue
+                keep_going = on_frame(ctx)
+                self.render_stats.tick(ctx.captured_at)
+                if not keep_going:
+                    break
+        finally:
+            self.stop()
+
+    def stats(self) -> dict:
+        return {
+            "capture": self.capture_stats.as_dict(),
+            "inference": self.inference_stats.as_dict(),
+            "render": self.render_stats.as_dict(),
+            "capture_queue": {"depth": self.captured.depth, "dropped": self.captured.dropped},
+            "inference_queue": {"depth": self.inferred.depth, "dropped": self.inferred.dropped},
+            "scheduler": self.scheduler.stats() if self.scheduler is not None else None,
+        }
@@ -1,16 +1,23 @@
 import cv2
 import numpy as np
 
+from events import Level, events
+
+MOVING_SCORE_THRESHOLD = 90  # mean face-pixel difference, can tweak this threshold
+MOVING_FRAMES_TO_ELIMINATE = 3
+
 class Player:
+    __slots__ = ("id", "face_filter", "moving_frame_count", "face_size")
+
     def __init__(self, id: int, face_filter: np.ndarray | None = None):
         self.id = id
         self.face_filter = face_filter
         self.moving_frame_count = 0
         self.face_size = 0 # for win condition
 
-    def is_moving(self, current_face: np.ndarray) -> bool:
+    def face_difference(self, current_face: np.ndarray) -> float | None:
         if self.face_filter is None or current_face is None:
-            return False
+            return None
 
         # Resize current face to match stored size just in case
         current_face = cv2.resize(current_face, (100, 100))
@@ -19,23 +26,34 @@ class Player:
         diff = cv2.absdiff(self.face_filter, current_face)
 
         # Compute mean pixel difference
-        score = np.mean(diff)
+        return float(np.mean(diff))
+
+    def is_moving(self, current_face: np.ndarray) -> bool:
+        score = self.face_difference(current_face)
+        if score is None:
+            return False
+
+        if events.enabled(Level.DEBUG):
+            events.emit("motion_score", Level.DEBUG, player=self.id, score=score)
 
-        print(f"[Player {self.id}] Difference Score: {score}")
+        return self.update_moving_streak(score > MOVING_SCORE_THRESHOLD)
 
-       # Cooldown logic: only eliminate if the difference score is high for several frames
-        if score > 90:  # can tweak this threshold
+    def update_moving_streak(self, moved: bool) -> bool:
+       # Cooldown logic: only eliminate if the motion score is high for several frames
+        if moved:
             self.moving_frame_count += 1
         else:
             self.moving_frame_count = 0  # reset if they stopped moving
 
         # Only flag if moved in 3+ frames in a row
-        return self.moving_frame_count >= 3
+        return self.moving_frame_count >= MOVING_FRAMES_TO_ELIMINATE
 
     def update_face_size(self, size: int):
         self.face_size = size
-        print(f"[Player {self.id}] Updated face_size: {self.face_size}")
+        if events.enabled(Level.DEBUG):
+            events.emit("face_size", Level.DEBUG, player=self.id, face_size=size)
 
     def is_won(self, winning_threshold: int = 200) -> bool:
-        print(f"[Player {self.id}] Checking win: face_size={self.face_size}, threshold={winning_threshold}")
+        if events.enabled(Level.DEBUG):
+            events.emit("win_check", Level.DEBUG, player=self.id, face_size=self.face_size, threshold=winning_threshold)
         return self.face_size >= winning_threshold
@@ -0,0 +1,82 @@
+import json
+import os
+import time
+import numpy as np
+
+from cv_interface import crop_faces, select_face_boxes
+from player import Player
+from player_table import PlayerTable
+from tracker import PlayerTracker, greedy_assignment
+
+# On-disk layout, one directory:
+#   index.json      {"version": 1, "ids": [...], "saved_at": ...}
+#   templates.npy   (N, 100, 100) uint8 face templates
+# templates.npy is opened memory-mapped, so loading a registry doesn't read the templates until matching.
+
+REGISTRY_VERSION = 1
+
+
+class PlayerRegistry:
+    def __init__(self, path: str, max_template_difference: float = 60.0, min_match_fraction: float = 0.5):
+        self.path = path
+        self.max_template_difference = max_template_difference  # mean gray-level difference to accept a match
+        self.min_match_fraction = min_match_fraction  # of the people in frame; fewer = a different group
+
+    def _file(self, name: str) -> str:
+        return os.path.join(self.path, name)
+
+    def exists(self) -> bool:
+        return os.path.exists(self._file("index.json"))
+
+    def save(self, table: PlayerTable) -> None:
+        os.makedirs(self.path, exist_ok=True)
+        known = np.flatnonzero(table.has_template)
+        np.save(self._file("templates.npy"), table.face_templates[known])
+        # index last: a registry is only valid once all arrays are written
+        with open(self._file("index.json"), "w") as f:
+            json.dump({"version": REGISTRY_VERSION, "ids": table.ids[known].tolist(), "saved_at": time.time()}, f)
+        print(f"💾 Saved {len(known)} player(s) to {self.path}")
+
+    def load(self) -> tuple[list[int], np.ndarray]:
+        with open(self._file("index.json")) as f:
+            index = json.load(f)
+        if index.get("version") != REGISTRY_VERSION:
+            raise ValueError(f"Unsupported player registry version {index.get('version')} in {self.path}")
+        return index["ids"], np.load(self._file("templates.npy"), mmap_mode="r")
+
+    def rematch(self, frame: np.ndarray, people: np.ndarray,
+                tracker: PlayerTracker | None = None) -> tuple[dict[int, Player], list]:
+        # Match everyone in this frame against known templates; newcomers get fresh ids.
+        # Returns ({}, []) unless most people in frame are recognized, so a new group registers interactively.
+        ids, templates = self.load()
+        rows, boxes = select_face_boxes(people, frame.shape)
+        faces = crop_faces(frame, boxes)
+        if not faces:
+            return {}, []
+
+        detected = np.stack(faces).astype(np.int16)
+        difference = np.abs(np.asarray(templates, dtype=np.int16)[:, None] - detected[None]).mean(axis=(2, 3))
+        difference[difference > self.max_template_difference] = np.inf
+
+        player_ids = [None] * len(faces)
+        for known, d in greedy_assignment(difference):
+            player_ids[d] = ids[known]
+        recognized = sum(player_id is not None for player_id in player_ids)
+        if recognized < self.min_match_fraction * len(faces) or not recognized:
+            print(f"🔁 Only {recognized}/{len(faces)} people recognized, registering from scratch")
+            return {}, []
+        next_id = max(ids, default=0) + 1
+
+        players = {}
+        for row, face, player_id in zip(rows, faces, player_ids):
+            if player_id is None:
+                player_id = next_id
+                next_id += 1
+                print(f"Player_{player_id} initialized (new)")
+            else:
+                print(f"Player_{player_id} recognized")
+            # the fresh crop is the reference for this round; identity comes from the registry
+            players[player_id] = Player(id=player_id, face_filter=face)
+            if tracker is not None:
+                tracker.register(player_id, people[0, row], frame.shape)
+        return players, boxes
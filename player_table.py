@@ -0,0 +1,125 @@
+import numpy as np
+
+from player import Player, MOVING_FRAMES_TO_ELIMINATE
+
+PLAYING, WON, LOST = 0, 1, 2
+FACE_TEMPLATE_SHAPE = (100, 100)
+
+def _append(array: np.ndarray, value) -> np.ndarray:
+    return np.concatenate([array, np.asarray(value, dtype=array.dtype)[np.newaxis]])
+
+
+class PlayerTable:
+    # Struct-of-arrays game state: one row (slot) per registered player, status instead of three dicts
+    def __init__(self):
+        self.ids = np.zeros(0, dtype=np.int32)
+        self.status = np.zeros(0, dtype=np.int8)
+        self.face_size = np.zeros(0, dtype=np.int32)
+        self.moving_frame_count = np.zeros(0, dtype=np.int16)
+        self.keypoints = np.zeros((0, 17, 3), dtype=np.float32)  # last seen, pixels [y, x, score]
+        self.face_templates = np.zeros((0, *FACE_TEMPLATE_SHAPE), dtype=np.uint8)
+        self.has_template = np.zeros(0, dtype=bool)
+        self._slots: dict[int, int] = {}
+
+    @classmethod
+    def from_players(cls, players: dict[int, Player]) -> "PlayerTable":
+        table = cls()
+        for player in players.values():
+            table.add(player.id, player.face_filter, player.face_size)
+        return table
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def add(self, player_id: int, face_filter: np.ndarray | None = None, face_size: int = 0) -> "PlayerView":
+        slot = len(self.ids)
+        self.ids = _append(self.ids, player_id)
+        self.status = _append(self.status, PLAYING)
+        self.face_size = _append(self.face_size, face_size)
+        self.moving_frame_count = _append(self.moving_frame_count, 0)
+        self.keypoints = _append(self.keypoints, np.zeros((17, 3)))
+        self.face_templates = _append(self.face_templates,
+                                      np.zeros(FACE_TEMPLATE_SHAPE) if face_filter is None else face_filter)
+        self.has_template = _append(self.has_template, face_filter is not None)
+        self._slots[player_id] = slot
+        return PlayerView(self, slot)
+
+    def slots(self, player_ids) -> np.ndarray:
+        return np.array([self._slots[pid] for pid in player_ids], dtype=np.intp)
+
+    def ids_with_status(self, status: int) -> np.ndarray:
+        return self.ids[self.status == status]
+
+    def count(self, status: int) -> int:
+        return int(np.count_nonzero(self.status == status))
+
+    def players(self, status: int) -> dict[int, "PlayerView"]:
+        return {int(self.ids[slot]): PlayerView(self, slot) for slot in np.flatnonzero(self.status == status)}
+
+    def set_face_sizes(self, player_ids, sizes) -> None:
+        self.face_size[self.slots(player_ids)] = sizes
+
+    def set_keypoints(self, player_ids, keypoints: np.ndarray) -> None:
+        self.keypoints[self.slots(player_ids)] = keypoints
+
+    def check_winning(self, winning_threshold: int) -> np.ndarray:
+        won = (self.status == PLAYING) & (self.face_size >= winning_threshold)
+        self.status[won] = WON
+        return self.ids[won]
+
+    def update_motion_streaks(self, player_ids, moved: np.ndarray,
+                              frames_to_eliminate: int = MOVING_FRAMES_TO_ELIMINATE) -> np.ndarray:
+        # Same cooldown as Player.update_moving_streak, for every scored player at once; returns eliminated ids
+        slots = self.slots(player_ids)
+        counts = np.where(moved, self.moving_frame_count[slots] + 1, 0)
+        self.moving_frame_count[slots] = counts
+        caught = slots[(counts >= frames_to_eliminate) & (self.status[slots] == PLAYING)]
+        self.status[caught] = LOST
+        return self.ids[caught]
+
+
+class PlayerView(Player):
+    # Player-compatible handle onto one PlayerTable slot
+    __slots__ = ("_table", "_slot")
+
+    def __init__(self, table: PlayerTable, slot: int):
+        self._table = table
+        self._slot = slot
+
+    @property
+    def id(self) -> int:
+        return int(self._table.ids[self._slot])
+
+    @property
+    def status(self) -> int:
+        return int(self._table.status[self._slot])
+
+    @property
+    def face_filter(self) -> np.ndarray | None:
+        return self._table.face_templates[self._slot] if self._table.has_template[self._slot] else None
+
+    @face_filter.setter
+    def face_filter(self, face: np.ndarray | None) -> None:
+        if face is not None:
+            self._table.face_templates[self._slot] = face
+        self._table.has_template[self._slot] = face is not None
+
+    @property
+    def moving_frame_count(self) -> int:
+        return int(self._table.moving_frame_count[self._slot])
+
+    @moving_frame_count.setter
+    def moving_frame_count(self, count: int) -> None:
+        self._table.moving_frame_count[self._slot] = count
+
+    @property
+    def face_size(self) -> int:
+        return int(self._table.face_size[self._slot])
+
+    @face_size.setter
+    def face_size(self, size: int) -> None:
+        self._table.face_size[self._slot] = size
+
+    @property
+    def keypoints(self) -> np.ndarray:
+        return self._table.keypoints[self._slot]
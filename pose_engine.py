@@ -0,0 +1,174 @@
+import sys
+import threading
+import time
+from typing import Protocol
+import cv2
+import numpy as np
+
+from backends import InferenceBackend, create_backend
+from constants import (INFERENCE_BACKEND, INFERENCE_THREADS, INFERENCE_WORKER, MOVENET_INPUT_SIZE, MOVENET_MAX_BATCH,
+                       MOVENET_MODEL_PATH)
+from roi import map_roi_people, roi_input_size
+
+def preprocess_frame(frame, input_size=MOVENET_INPUT_SIZE):
+    # input_size is a square side or a (width, height) pair
+    if isinstance(input_size, int):
+        input_size = (input_size, input_size)
+    img = cv2.resize(frame, input_size)
+    img = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
+    img = img.astype(np.int32)  # MoveNet expects int32
+    return img[np.newaxis, ...]
+
+class Preprocessor:
+    # preprocess_frame() without per-call allocations: resize and convert BGR -> RGB into owned uint8 buffers,
+    # then widen to int32 straight into the model input (our own buffer, or the interpreter's tensor).
+    # Widening from a contiguous RGB buffer; copying through a reversed-channel view is ~2.5x slower.
+    def __init__(self):
+        self._resized: dict[tuple[int, int], np.ndarray] = {}
+        self._rgb: dict[tuple[int, int], np.ndarray] = {}
+        self._inputs: dict[tuple[int, int], np.ndarray] = {}
+
+    def __call__(self, frame: np.ndarray, input_size=MOVENET_INPUT_SIZE, out: np.ndarray | None = None) -> np.ndarray:
+        if isinstance(input_size, int):
+            input_size = (input_size, input_size)
+        width, height = input_size
+
+        resized = self._resized.get(input_size)
+        if resized is None:
+            resized = self._resized[input_size] = np.empty((height, width, 3), dtype=np.uint8)
+        cv2.resize(frame, input_size, dst=resized)
+        rgb = self._rgb.get(input_size)
+        if rgb is None:
+            rgb = self._rgb[input_size] = np.empty((height, width, 3), dtype=np.uint8)
+        cv2.cvtColor(resized, cv2.COLOR_BGR2RGB, dst=rgb)
+
+        if out is None:
+            out = self._inputs.get(input_size)
+            if out is None:
+                out = self._inputs[input_size] = np.empty((1, height, width, 3), dtype=np.int32)
+        np.copyto(out[0], rgb)
+        return out
+
+def _memory_mb() -> tuple[float, str] | None:
+    # -> (MB, what it measures); psutil gives current resident memory, the resource fallback only peak RSS
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / 2 ** 20, "resident"
+    except ImportError:
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None  # e.g. Windows without psutil
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (2 ** 20 if sys.platform == "darwin" else 1024), "peak resident"  # bytes on macOS, KB elsewhere
+
+
+class PoseDetector(Protocol):
+    # What callers of get_pose_engine() may rely on: PoseEngine in-process, or InferenceWorker out of process
+    input_size: int
+
+    def detect(self, frame: np.ndarray) -> np.ndarray: ...
+
+    def detect_roi(self, frame: np.ndarray, roi: tuple[int, int, int, int]) -> np.ndarray: ...
+
+    def detect_batch(self, frames: list[np.ndarray]) -> list[np.ndarray]: ...
+
+
+class PoseEngine:
+    # One MoveNet MultiPose instance shared by every caller in the process
+    def __init__(self, model_path: str = MOVENET_MODEL_PATH, input_size: int = MOVENET_INPUT_SIZE,
+                 backend: str = INFERENCE_BACKEND, num_threads: int = INFERENCE_THREADS,
+                 max_batch: int = MOVENET_MAX_BATCH):
+        self.model_path = model_path
+        self.max_batch = max_batch  # frames per model call in detect_batch
+        self.input_size = input_size
+        self.backend_name = backend
+        self.num_threads = num_threads
+        self.backend: InferenceBackend | None = None
+        self.source = model_path
+        self.load_time_seconds = 0.0
+        self.memory_delta_mb: float | None = None  # None when this platform can't measure it
+        self._infer = None
+        self._fill_input = None  # writes the model input in place when the runtime exposes its buffer
+        self._preprocess = Preprocessor()
+        self._batches: dict[int, np.ndarray] = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self) -> None:
+        memory_before = _memory_mb()
+        start = time.perf_counter()
+
+        self.backend = create_backend(self.backend_name, self.model_path, self.num_threads)
+        self.source = self.backend.source
+        self._infer = self.backend.infer
+        self._fill_input = self.backend.fill_input
+        self.warm_up()
+
+        self.load_time_seconds = time.perf_counter() - start
+        memory_after = _memory_mb()
+        if memory_before is None or memory_after is None:
+            memory = "memory use unavailable, install psutil"
+        else:
+            self.memory_delta_mb = memory_after[0] - memory_before[0]
+            memory = f"+{self.memory_delta_mb:.0f} MB {memory_after[1]}"
+        print(f"⚙️ MoveNet ({self.backend.name}) loaded from {self.source} in {self.load_time_seconds:.2f}s ({memory})")
+
+    def warm_up(self) -> None:
+        # First call traces/allocates the graph; pay that cost at startup instead of mid-game
+        blank = np.zeros((1, self.input_size, self.input_size, 3), dtype=np.int32)
+        self.infer(blank)
+
+    def infer(self, input_img: np.ndarray) -> np.ndarray:
+        with self._lock:
+            return self._infer(input_img)  # shape: (1, 6, 56)
+
+    def _detect(self, frame: np.ndarray, input_size) -> np.ndarray:
+        width, height = (input_size, input_size) if isinstance(input_size, int) else input_size
+        with self._lock:
+            if self._fill_input is not None:
+                self._fill_input((1, height, width, 3), lambda out: self._preprocess(frame, input_size, out))
+                return self._infer(None)
+            return self._infer(self._preprocess(frame, input_size))
+
+    def detect(self, frame: np.ndarray) -> np.ndarray:
+        return self._detect(frame, self.input_size)
+
+    def detect_batch(self, frames: list[np.ndarray]) -> list[np.ndarray]:
+        # One (1, 6, 56) result per frame, up to max_batch frames per model call
+        size = self.input_size
+        results = []
+        with self._lock:
+            for start in range(0, len(frames), self.max_batch):
+                chunk = frames[start:start + self.max_batch]
+                batch = self._batches.get(len(chunk))
+                if batch is None:
+                    batch = self._batches[len(chunk)] = np.empty((len(chunk), size, size, 3), dtype=np.int32)
+                for i, frame in enumerate(chunk):
+                    self._preprocess(frame, size, out=batch[i:i + 1])
+                people = self._infer(batch)
+                results.extend(people[i:i + 1] for i in range(len(chunk)))
+        return results
+
+    def detect_roi(self, frame: np.ndarray, roi: tuple[int, int, int, int]) -> np.ndarray:
+        # Same (1, 6, 56) result as detect(), but the model only sees the crop
+        x1, y1, x2, y2 = roi
+        people = self._detect(frame[y1:y2, x1:x2], roi_input_size(roi, self.input_size))
+        return map_roi_people(people, roi, frame.shape)
+
+
+_engine: PoseDetector | None = None
+_engine_lock = threading.Lock()
+
+def get_pose_engine() -> PoseDetector:
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                if INFERENCE_WORKER:
+                    from inference_worker import InferenceWorker  # same detect API, MoveNet in another process
+                    _engine = InferenceWorker()
+                else:
+                    _engine = PoseEngine()
+    return _engine
@@ -0,0 +1,176 @@
+import argparse
+import json
+import os
+import time
+from collections import deque
+
+import cv2
+
+from constants import GameState
+from frame_context import FrameContext
+from main import Game
+from player_table import PLAYING, WON, LOST
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp")
+REST_OF_REPLAY_SECONDS = 10 ** 6  # once the script runs out, the current light lasts until the footage ends
+
+
+class FrameDirectorySource:
+    # cv2.VideoCapture-like reader over an image sequence, in file name order
+    def __init__(self, path: str):
+        self.paths = sorted(os.path.join(path, name) for name in os.listdir(path)
+                            if name.lower().endswith(IMAGE_EXTENSIONS))
+        self._next = 0
+
+    def isOpened(self) -> bool:
+        return bool(self.paths)
+
+    def read(self):
+        if self._next >= len(self.paths):
+            return False, None
+        frame = cv2.imread(self.paths[self._next])
+        self._next += 1
+        return frame is not None, frame
+
+    def get(self, prop_id) -> float:
+        return 0.0
+
+    def release(self) -> None:
+        pass
+
+def open_source(path: str):
+    return FrameDirectorySource(path) if os.path.isdir(path) else cv2.VideoCapture(path)
+
+
+class ScriptedTimeline:
+    # Light durations in order, e.g. [["GREEN_LIGHT", 6.0], ["RED_LIGHT", 5.0], ...]; a leading
+    # ["CALIBRATE", 3.0] entry replays the calibration stage, footage without one skips it
+    def __init__(self, entries: list[tuple[GameState, float]]):
+        self.entries = deque(entries)
+
+    @classmethod
+    def load(cls, path: str) -> "ScriptedTimeline":
+        with open(path) as f:
+            return cls([(GameState[state], float(seconds)) for state, seconds in json.load(f)])
+
+    def expects(self, state: GameState) -> bool:
+        return bool(self.entries) and self.entries[0][0] == state
+
+    def duration(self, state: GameState) -> float:
+        if not self.entries:
+            return REST_OF_REPLAY_SECONDS
+        expected, seconds = self.entries.popleft()
+        if expected != state:
+            raise ValueError(f"Timeline expected {expected.name} next but the game entered {state.name}")
+        return seconds
+
+
+class MediaClock:
+    # Game clock that advances with the footage, not with how fast we process it
+    def __init__(self, fps: float):
+        self.fps = fps
+        self.frame_index = 0
+
+    @property
+    def seconds(self) -> float:
+        return self.frame_index / self.fps
+
+    def __call__(self) -> float:
+        return self.seconds
+
+
+class ReplayDriver:
+    # Runs the full referee headless and uncapped over recorded footage
+    def __init__(self, source, timeline: ScriptedTimeline | None = None, fps: float | None = None,
+                 register_at: int = 0, engine=None):
+        self.source = source
+        self.clock = MediaClock(fps or source.get(cv2.CAP_PROP_FPS) or 30.0)
+        self.register_at = register_at
+        self.engine = engine
+        self.game = Game(clock=self.clock, timeline=timeline)
+
+    def step(self, ctx: FrameContext) -> dict:
+        game = self.game
+        record = {"frame": self.clock.frame_index, "media_time": round(self.clock.seconds, 3)}
+
+        if game.state == GameState.READ_FACES:
+            if self.clock.frame_index >= self.register_at and ctx.detections():
+                game.read_faces_from(ctx)
+            record.update(state=GameState.READ_FACES.name, registered=game.players.ids.tolist())
+            return record
+
+        record["state"] = game.state.name
+        status_before = game.players.status.copy()
+        game.step(ctx)
+        changed = game.players.status != status_before
+
+        record.update(
+            next_state=game.state.name,
+            assignments={str(pid): row for pid, row in ctx.assignments.items()},
+            eliminated=game.players.ids[changed & (game.players.status == LOST)].tolist(),
+            won=game.players.ids[changed & (game.players.status == WON)].tolist(),
+            playing=game.players.ids_with_status(PLAYING).tolist(),
+            keyframe=ctx.keyframe,
+        )
+        return record
+
+    def run(self, decisions=None) -> dict:
+        frames = 0
+        started = time.perf_counter()
+
+        while self.game.state != GameState.END_GAME:
+            ctx = FrameContext.capture(self.source, self.engine, self.game.roi_planner, self.game.scheduler, self.clock)
+            if ctx is None:
+                break
+
+            frame_started = time.perf_counter()
+            record = self.step(ctx)
+            record["frame_ms"] = round((time.perf_counter() - frame_started) * 1000, 3)
+            if decisions is not None:
+                decisions.write(json.dumps(record) + "\n")
+
+            frames += 1
+            self.clock.frame_index += 1
+
+        elapsed = time.perf_counter() - started
+        return {
+            "frames": frames,
+            "seconds": round(elapsed, 3),
+            "fps": round(frames / elapsed, 1) if elapsed > 0 else 0.0,
+            "final_state": self.game.state.name,
+            "winners": self.game.players.ids_with_status(WON).tolist(),
+            "eliminated": self.game.players.ids_with_status(LOST).tolist(),
+            "transitions": self.game.deadlines.stats(),
+            "motion_gate": self.game.motion_gate.stats() if self.game.motion_gate is not None else None,
+        }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Replay recorded footage through the referee, headless.")
+    parser.add_argument("source", help="video file or directory of frames")
+    parser.add_argument("--timeline", help="JSON list of [state, seconds] light durations")
+    parser.add_argument("--fps", type=float, help="media frame rate (default: from the video, else 30)")
+    parser.add_argument("--register-at", type=int, default=0, help="first frame to register players from")
+    parser.add_argument("--out", help="write per-frame decisions as JSONL")
+    args = parser.parse_args()
+
+    source = open_source(args.source)
+    if not source.isOpened():
+        print(f"❌ Could not open {args.source}")
+        return
+
+    timeline = ScriptedTimeline.load(args.timeline) if args.timeline else None
+    driver = ReplayDriver(source, timeline, args.fps, args.register_at)
+
+    if args.out:
+        with open(args.out, "w") as decisions:
+            summary = driver.run(decisions)
+    else:
+        summary = driver.run()
+    source.release()
+
+    print(json.dumps(summary))
+
+
+if __name__ == "__main__":
+    main()
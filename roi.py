@@ -0,0 +1,62 @@
+import numpy as np
+
+from constants import MOVENET_INPUT_SIZE
+
+INPUT_MULTIPLE = 32  # MoveNet MultiPose takes any input whose sides are multiples of 32
+
+
+def round_to_multiple(value: float, multiple: int = INPUT_MULTIPLE) -> int:
+    return max(multiple, int(round(value / multiple)) * multiple)
+
+def roi_input_size(roi: tuple[int, int, int, int], long_side: int = MOVENET_INPUT_SIZE) -> tuple[int, int]:
+    # (width, height) for the model, keeping the crop's aspect ratio
+    x1, y1, x2, y2 = roi
+    crop_w, crop_h = x2 - x1, y2 - y1
+    scale = long_side / max(crop_w, crop_h)
+    return round_to_multiple(crop_w * scale), round_to_multiple(crop_h * scale)
+
+def map_roi_people(people: np.ndarray, roi: tuple[int, int, int, int], frame_shape) -> np.ndarray:
+    # Keypoints and boxes come back normalized to the crop; re-normalize them to the full frame
+    h, w = frame_shape[:2]
+    x1, y1, x2, y2 = roi
+    mapped = people.copy()
+    ys = np.r_[0:51:3, 51, 53]
+    xs = np.r_[1:51:3, 52, 54]
+    mapped[..., ys] = (y1 + people[..., ys] * (y2 - y1)) / h
+    mapped[..., xs] = (x1 + people[..., xs] * (x2 - x1)) / w
+    return mapped
+
+
+class RoiPlanner:
+    # Picks the crop MoveNet runs on: the union of tracked players plus a margin, with a periodic full frame
+    def __init__(self, margin: float = 0.25, full_frame_every: int = 15, max_area_fraction: float = 0.8):
+        self.margin = margin
+        self.full_frame_every = full_frame_every  # catches newcomers and players outside the band
+        self.max_area_fraction = max_area_fraction  # bigger crops than this aren't worth it
+        self.frames_planned = 0
+        self.full_frame_passes = 0
+        self._union: np.ndarray | None = None
+
+    def update(self, boxes) -> None:
+        boxes = np.asarray(boxes, dtype=np.float32).reshape(-1, 4)
+        if len(boxes) == 0:
+            self._union = None
+            return
+        self._union = np.concatenate([boxes[:, :2].min(axis=0), boxes[:, 2:].max(axis=0)])
+
+    def next_roi(self, frame_shape) -> tuple[int, int, int, int] | None:
+        # None means run on the full frame
+        self.frames_planned += 1
+        h, w = frame_shape[:2]
+        if self._union is None or self.frames_planned % self.full_frame_every == 0:
+            self.full_frame_passes += 1
+            return None
+
+        x1, y1, x2, y2 = self._union
+        pad_x, pad_y = (x2 - x1) * self.margin, (y2 - y1) * self.margin
+        roi = (max(0, int(x1 - pad_x)), max(0, int(y1 - pad_y)), min(w, int(x2 + pad_x)), min(h, int(y2 + pad_y)))
+        if roi[2] <= roi[0] or roi[3] <= roi[1] or \
+                (roi[2] - roi[0]) * (roi[3] - roi[1]) > self.max_area_fraction * w * h:
+            self.full_frame_passes += 1
+            return None
+        return roi
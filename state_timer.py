@@ -0,0 +1,57 @@
+from collections import deque
+
+import numpy as np
+
+from constants import GameState, RED_LIGHT_GRACE_SECONDS
+from events import events
+
+
+class DeadlineScheduler:
+    # Light deadlines on the monotonic (or media) clock, checked against each frame's capture time.
+    # A transition fires on the first frame captured at or past its deadline, and the next light
+    # runs from the deadline itself, so a slow tick doesn't stretch the following light.
+    def __init__(self, grace_seconds: float = RED_LIGHT_GRACE_SECONDS, history: int = 256):
+        self.grace_seconds = grace_seconds
+        self.state: GameState | None = None
+        self.started_at = 0.0  # when the light was due; the next deadline chains from here
+        self.shown_at = 0.0  # capture time of the first frame that showed it, where reaction time starts
+        self.deadline = float("inf")
+        self.overshoots: deque[float] = deque(maxlen=history)
+        self.judged_frames = 0
+        self.grace_frames = 0
+
+    def start(self, state: GameState, duration: float, at: float) -> None:
+        # fresh timeline, e.g. right after registration
+        self.state, self.started_at, self.shown_at, self.deadline = state, at, at, at + duration
+
+    def due(self, at: float) -> bool:
+        return at >= self.deadline
+
+    def advance(self, state: GameState, duration: float, at: float) -> None:
+        overshoot = at - self.deadline
+        self.overshoots.append(overshoot)
+        events.timing("transition_overshoot", overshoot)
+        # after a long stall (e.g. a blocking dialog) chaining from the old deadline would skip lights
+        started_at = self.deadline if overshoot < duration else at
+        self.start(state, duration, started_at)
+        self.shown_at = at  # players only see the new light from this frame on
+
+    def remaining(self, at: float) -> float:
+        return max(self.deadline - at, 0.0)
+
+    def judging(self, at: float) -> bool:
+        # only frames captured during this red light, after the grace window, can eliminate anyone
+        if self.state != GameState.RED_LIGHT or not self.shown_at + self.grace_seconds <= at < self.deadline:
+            self.grace_frames += self.state == GameState.RED_LIGHT
+            return False
+        self.judged_frames += 1
+        return True
+
+    def stats(self) -> dict:
+        overshoots = np.array(self.overshoots) * 1000
+        stats = {"transitions": len(overshoots), "judged_frames": self.judged_frames, "grace_frames": self.grace_frames}
+        if len(overshoots):
+            stats.update(overshoot_mean_ms=round(float(overshoots.mean()), 2),
+                         overshoot_p95_ms=round(float(np.percentile(overshoots, 95)), 2),
+                         overshoot_max_ms=round(float(overshoots.max()), 2))
+        return stats
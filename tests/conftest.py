@@ -0,0 +1,32 @@
+import os
+import sys
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+FRAME_SHAPE = (480, 640, 3)
+
+
+def make_person(cx: float, cy: float = 0.5, height: float = 0.4, score: float = 0.9) -> np.ndarray:
+    # One MoveNet MultiPose row: 17 x [y, x, score], box [ymin, xmin, ymax, xmax], pose score; normalized
+    person = np.zeros(56, dtype=np.float32)
+    keypoints = person[:51].reshape(17, 3)
+    keypoints[:, 0] = cy + np.linspace(-height / 2, height / 2, 17)
+    keypoints[:, 1] = cx + np.linspace(-height / 8, height / 8, 17)
+    keypoints[:, 2] = score
+    person[51:55] = (cy - height / 2, cx - height / 4, cy + height / 2, cx + height / 4)
+    person[55] = score
+    return person
+
+
+def make_people(*persons: np.ndarray) -> np.ndarray:
+    people = np.zeros((1, 6, 56), dtype=np.float32)
+    for row, person in enumerate(persons):
+        people[0, row] = person
+    return people
+
+
+@pytest.fixture
+def frame_shape():
+    return FRAME_SHAPE
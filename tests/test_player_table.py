@@ -0,0 +1,64 @@
+import numpy as np
+
+from player import MOVING_FRAMES_TO_ELIMINATE
+from player_table import LOST, PLAYING, WON, PlayerTable
+
+
+def table_of(*player_ids: int) -> PlayerTable:
+    table = PlayerTable()
+    for player_id in player_ids:
+        table.add(player_id)
+    return table
+
+
+def test_consecutive_moving_frames_eliminate():
+    table = table_of(1, 2)
+
+    for _ in range(MOVING_FRAMES_TO_ELIMINATE - 1):
+        assert table.update_motion_streaks([1, 2], np.array([True, False])).tolist() == []
+    assert table.update_motion_streaks([1, 2], np.array([True, False])).tolist() == [1]
+
+    assert table.ids_with_status(LOST).tolist() == [1]
+    assert table.ids_with_status(PLAYING).tolist() == [2]
+
+
+def test_a_still_frame_resets_the_streak():
+    table = table_of(1)
+
+    for _ in range(MOVING_FRAMES_TO_ELIMINATE - 1):
+        table.update_motion_streaks([1], np.array([True]))
+    table.update_motion_streaks([1], np.array([False]))
+
+    assert table.moving_frame_count[table.slots([1])].tolist() == [0]
+    assert table.count(LOST) == 0
+
+
+def test_unmatched_players_keep_their_streak():
+    table = table_of(1, 2)
+    for _ in range(MOVING_FRAMES_TO_ELIMINATE - 1):
+        table.update_motion_streaks([1, 2], np.array([True, True]))
+
+    # player 2 not matched to a detection this frame: not scored, streak untouched
+    table.update_motion_streaks([1], np.array([False]))
+    assert table.moving_frame_count[table.slots([2])].tolist() == [MOVING_FRAMES_TO_ELIMINATE - 1]
+
+    assert table.update_motion_streaks([2], np.array([True])).tolist() == [2]
+
+
+def test_per_player_frames_to_eliminate():
+    table = table_of(1, 2)
+
+    for _ in range(2):
+        caught = table.update_motion_streaks([1, 2], np.array([True, True]), np.array([2, 3]))
+
+    assert caught.tolist() == [1]
+
+
+def test_check_winning_only_flips_playing_rows():
+    table = table_of(1, 2, 3)
+    table.set_face_sizes([1, 2, 3], [400, 400, 100])
+    table.status[table.slots([2])] = LOST
+
+    assert table.check_winning(300).tolist() == [1]
+    assert table.status.tolist() == [WON, LOST, PLAYING]
+    assert table.check_winning(300).tolist() == []
@@ -0,0 +1,44 @@
+from conftest import make_people, make_person
+from tracker import PlayerTracker
+
+
+def registered_tracker(frame_shape) -> PlayerTracker:
+    tracker = PlayerTracker()
+    tracker.register(1, make_person(0.25), frame_shape)
+    tracker.register(2, make_person(0.75), frame_shape)
+    return tracker
+
+
+def test_ids_stay_with_people_when_movenet_swaps_rows(frame_shape):
+    tracker = registered_tracker(frame_shape)
+
+    assert tracker.update(make_people(make_person(0.25), make_person(0.75)), frame_shape) == {1: 0, 2: 1}
+    assert tracker.update(make_people(make_person(0.76), make_person(0.26)), frame_shape) == {1: 1, 2: 0}
+
+
+def test_low_score_rows_are_not_matched(frame_shape):
+    tracker = registered_tracker(frame_shape)
+
+    assignments = tracker.update(make_people(make_person(0.25), make_person(0.75, score=0.05)), frame_shape)
+
+    assert assignments == {1: 0}
+    assert tracker.tracks[2].missed == 1
+
+
+def test_lost_track_is_reacquired(frame_shape):
+    tracker = registered_tracker(frame_shape)
+    for _ in range(tracker.max_missed + 2):
+        assert tracker.update(make_people(make_person(0.75)), frame_shape) == {2: 0}
+    assert tracker.tracks[1].missed > tracker.max_missed
+
+    assignments = tracker.update(make_people(make_person(0.75), make_person(0.28)), frame_shape)
+
+    assert assignments == {1: 1, 2: 0}
+    assert tracker.tracks[1].missed == 0
+
+
+def test_retain_drops_tracks_of_players_out_of_the_game(frame_shape):
+    tracker = registered_tracker(frame_shape)
+    tracker.retain([2])
+
+    assert tracker.update(make_people(make_person(0.25), make_person(0.75)), frame_shape) == {2: 1}
@@ -0,0 +1,139 @@
+import numpy as np
+
+from box_ops import pairwise_iou
+from cv_interface import POSE_SCORE
+
+MOVENET_BOX = slice(51, 55)  # ymin, xmin, ymax, xmax
+
+
+def person_to_pixels(person: np.ndarray, frame_shape) -> tuple[np.ndarray, np.ndarray]:
+    # One MoveNet row -> (x1, y1, x2, y2) box and (17, [y, x, score]) keypoints in pixels
+    h, w = frame_shape[:2]
+    ymin, xmin, ymax, xmax = person[MOVENET_BOX]
+    box = np.array([xmin * w, ymin * h, xmax * w, ymax * h], dtype=np.float32)
+    keypoints = person[:51].reshape(17, 3).astype(np.float32) * (h, w, 1)
+    return box, keypoints
+
+
+def greedy_assignment(cost: np.ndarray) -> list[tuple[int, int]]:
+    # Cheapest pair first, each row and column used once, inf = not allowed;
+    # with <= 6 players this matches Hungarian in practice
+    used_rows, used_cols = set(), set()
+    pairs = []
+    for flat in np.argsort(cost, axis=None):
+        r, c = divmod(int(flat), cost.shape[1])
+        if not np.isfinite(cost[r, c]):
+            break
+        if r in used_rows or c in used_cols:
+            continue
+        used_rows.add(r)
+        used_cols.add(c)
+        pairs.append((r, c))
+    return pairs
+
+
+class Track:
+    __slots__ = ("player_id", "box", "velocity", "keypoints", "missed", "hits")
+
+    def __init__(self, player_id: int, box: np.ndarray, keypoints: np.ndarray):
+        self.player_id = player_id
+        self.box = box
+        self.velocity = np.zeros(4, dtype=np.float32)  # box change per frame
+        self.keypoints = keypoints
+        self.missed = 0
+        self.hits = 1
+
+    def predicted_box(self) -> np.ndarray:
+        return self.box + self.velocity * (self.missed + 1)
+
+    def predicted_keypoints(self) -> np.ndarray:
+        shift = (self.velocity[[1, 0]] + self.velocity[[3, 2]]) / 2 * (self.missed + 1)  # centre dy, dx
+        predicted = self.keypoints.copy()
+        predicted[:, :2] += shift
+        return predicted
+
+    def update(self, box: np.ndarray, keypoints: np.ndarray, smoothing: float) -> None:
+        step = (box - self.box) / (self.missed + 1)
+        self.velocity += smoothing * (step - self.velocity)
+        self.box = box
+        self.keypoints = keypoints
+        self.missed = 0
+        self.hits += 1
+
+    def mark_missed(self) -> None:
+        self.missed += 1
+        self.velocity *= 0.5  # don't coast a lost player across the frame
+
+
+class PlayerTracker:
+    # Keeps player identity across frames instead of trusting MoveNet's output order
+    def __init__(self, score_threshold: float = 0.2, keypoint_threshold: float = 0.3, iou_weight: float = 0.5,
+                 max_cost: float = 0.7, reacquire_cost: float = 0.9, max_missed: int = 10, smoothing: float = 0.5):
+        self.score_threshold = score_threshold
+        self.keypoint_threshold = keypoint_threshold
+        self.iou_weight = iou_weight
+        self.max_cost = max_cost
+        self.reacquire_cost = reacquire_cost  # looser gate once a track has been lost for max_missed frames
+        self.max_missed = max_missed
+        self.smoothing = smoothing
+        self.tracks: dict[int, Track] = {}
+
+    def register(self, player_id: int, person: np.ndarray, frame_shape) -> None:
+        self.tracks[player_id] = Track(player_id, *person_to_pixels(person, frame_shape))
+
+    def active_boxes(self) -> list[np.ndarray]:
+        # where each player still being followed should be this frame
+        return [track.predicted_box() for track in self.tracks.values() if track.missed <= self.max_missed]
+
+    def retain(self, player_ids) -> None:
+        keep = set(player_ids)
+        self.tracks = {pid: track for pid, track in self.tracks.items() if pid in keep}
+
+    def cost_matrix(self, det_boxes: np.ndarray, det_keypoints: np.ndarray) -> np.ndarray:
+        tracks = list(self.tracks.values())
+        pred_boxes = np.stack([track.predicted_box() for track in tracks])
+        pred_keypoints = np.stack([track.predicted_keypoints() for track in tracks])
+
+        iou = pairwise_iou(pred_boxes, det_boxes)  # (tracks, detections)
+
+        # mean distance over keypoints confident in both, relative to the predicted box diagonal
+        distance = np.linalg.norm(pred_keypoints[:, None, :, :2] - det_keypoints[None, :, :, :2], axis=3)
+        valid = ((pred_keypoints[:, None, :, 2] >= self.keypoint_threshold)
+                 & (det_keypoints[None, :, :, 2] >= self.keypoint_threshold))
+        valid_count = valid.sum(axis=2)
+        mean_distance = (distance * valid).sum(axis=2) / np.maximum(valid_count, 1)
+        diagonal = np.maximum(np.hypot(pred_boxes[:, 2] - pred_boxes[:, 0], pred_boxes[:, 3] - pred_boxes[:, 1]), 1)
+        keypoint_cost = np.where(valid_count > 0, np.minimum(mean_distance / diagonal[:, None], 1.0), 1.0)
+
+        cost = self.iou_weight * (1 - iou) + (1 - self.iou_weight) * keypoint_cost
+        gate = np.array([self.reacquire_cost if t.missed > self.max_missed else self.max_cost for t in tracks])
+        cost[cost > gate[:, None]] = np.inf
+        return cost
+
+    def update(self, people: np.ndarray, frame_shape) -> dict[int, int]:
+        # Returns player id -> MoveNet row for every player matched this frame
+        rows = np.flatnonzero(people[0, :, POSE_SCORE] >= self.score_threshold)
+        if not self.tracks:
+            return {}
+        if len(rows) == 0:
+            for track in self.tracks.values():
+                track.mark_missed()
+            return {}
+
+        detections = [person_to_pixels(people[0, row], frame_shape) for row in rows]
+        det_boxes = np.stack([box for box, _ in detections])
+        det_keypoints = np.stack([keypoints for _, keypoints in detections])
+        cost = self.cost_matrix(det_boxes, det_keypoints)
+
+        tracks = list(self.tracks.values())
+        matched_tracks = set()
+        assignments: dict[int, int] = {}
+        for t, d in greedy_assignment(cost):
+            matched_tracks.add(t)
+            tracks[t].update(det_boxes[d], det_keypoints[d], self.smoothing)
+            assignments[tracks[t].player_id] = int(rows[d])
+
+        for t, track in enumerate(tracks):
+            if t not in matched_tracks:
+                track.mark_missed()
+        return assignments